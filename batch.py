@@ -0,0 +1,122 @@
+"""Compute best ball matchup projections for many leagues without the Streamlit UI.
+
+    python batch.py --leagues 1312060096066355200 --usernames athal7 --week 3 --output week3.csv
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+import streamlit_app
+from streamlit_app import HTTP, Context, Data, League, Matchup, http_from_env
+
+# Week-wide reference data, loaded once per worker process
+_shared: dict = {}
+
+
+@dataclass
+class BatchContext:
+    season: int
+    week: int
+    username: Optional[str] = None
+
+
+def load_shared(season: int, week: int):
+    # A forked worker must not share the parent's pooled keep-alive connections
+    streamlit_app.HTTP = http_from_env()
+    _shared.update(Data.fetch({
+        'game_statuses': lambda: Data.get_game_statuses(season, week),
+        'players': lambda: Data.get_players(),
+        'projections': lambda: Data.get_projections(season, week),
+        'stats': lambda: Data.get_stats(season, week),
+    }))
+
+
+def matchup_rows(league_id, league_name: str, matchups: list[Matchup]) -> list[dict]:
+    rows = []
+    for matchup in matchups:
+        probability = matchup.win_probability
+        for team, opponent, win_probability in [
+                (matchup.team1, matchup.team2, probability),
+                (matchup.team2, matchup.team1, None if probability is None else 1 - probability)]:
+            rows.append({
+                'league_id': league_id,
+                'league': league_name,
+                'matchup_id': team.matchup_id,
+                'team': team.name,
+                'username': team.username,
+                'points': float(team.points),
+                'projection': float(team.projection),
+                'opponent': opponent.name,
+                'opponent_projection': float(opponent.projection),
+                'win_probability': win_probability,
+            })
+    return rows
+
+
+def league_rows(league_id, season: int, week: int) -> list[dict]:
+    context = BatchContext(season=season, week=week)
+    league = League(data=Data(league_id=league_id, context=context, **_shared))
+    return matchup_rows(league_id, league.name, league.matchups(context))
+
+
+def league_ids(leagues: list, usernames: list[str], season: int) -> list:
+    ids = list(leagues)
+    for username in usernames:
+        ids += Context._leagues(season, {'username': username})
+    return list(dict.fromkeys(ids))
+
+
+def write(rows: list[dict], output: Optional[str], fmt: str):
+    df = pd.DataFrame(rows)
+    if fmt == 'json':
+        text = df.to_json(orient='records', indent=2)
+    else:
+        text = df.to_csv(index=False)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--leagues', nargs='*', default=[], help="league ids")
+    parser.add_argument('--usernames', nargs='*', default=[],
+                        help="include every league of these users")
+    parser.add_argument('--season', type=int)
+    parser.add_argument('--week', type=int)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--format', choices=['csv', 'json'])
+    parser.add_argument('--output', help="file to write, defaults to stdout")
+    args = parser.parse_args()
+
+    if args.season is None or args.week is None:
+        current = HTTP.get_json(f"{Data.SLEEPER_URL}/state/nfl")
+        args.season = args.season or int(current['league_season'])
+        args.week = args.week or max(int(current['display_week']), 1)
+    fmt = args.format or ('json' if (args.output or '').endswith('.json') else 'csv')
+
+    ids = league_ids(args.leagues, args.usernames, args.season)
+    rows, failed = [], 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=load_shared,
+                             initargs=(args.season, args.week)) as pool:
+        futures = {pool.submit(league_rows, league_id, args.season, args.week): league_id
+                   for league_id in ids}
+        for future in as_completed(futures):
+            try:
+                rows += future.result()
+            except Exception as e:
+                failed += 1
+                print(f"League {futures[future]} failed: {e}", file=sys.stderr)
+    write(rows, args.output, fmt)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,55 @@
+import functools
+import hashlib
+import inspect
+import json
+import math
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
 import streamlit as st
+import numpy as np
 import pandas as pd
 import requests
-from dataclasses import InitVar, dataclass, field
-from typing import Optional, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import MISSING, InitVar, dataclass, field, fields
+from pathlib import Path
+from typing import Callable, Iterable, Optional, List, Sequence
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from yattag import Doc
 
-import sleeper_wrapper as sleeper
-
 METADATA_TTL = 60 * 60  # 1 hour
 STATS_TTL = 60 * 5      # 5 minutes
+LIVE_TTL = 60           # 1 minute
+LIVE_SLACK = 5          # seconds a live fragment tick may land early and still refresh
+IDLE_TTL = 60 * 60 * 6  # 6 hours
+PREGAME = 60 * 30       # poll like a live game this long before kickoff
+FINAL_GRACE = 60 * 15   # and this long after a final whistle, for stat corrections
+TTL_STEPS = [LIVE_TTL, STATS_TTL, 60 * 15, METADATA_TTL, IDLE_TTL]
+SIM_TRIALS = 20_000
+SIM_CHUNK = 2_500  # trials simulated at once, bounding the size of the working arrays
+SIM_CV = 0.6  # spread of a player's remaining output relative to its projection
+FETCH_WORKERS = 4
+HTTP_TIMEOUT = (3.05, 20)  # connect, read seconds
+HTTP_RETRIES = 3
+HTTP_VALIDATED_BYTES = 16 * 1024 * 1024  # response bodies kept in memory for revalidation
+METRICS_PATH = os.environ.get('SLEEPER_METRICS_PATH')
+CACHE_DIR = Path(os.environ.get(
+    'SLEEPER_CACHE_DIR', Path.home() / '.cache' / 'sleeper-best-ball'))
+# live, record, replay or server; see http_from_env
+SOURCE = os.environ.get('SLEEPER_SOURCE', 'live')
+FIXTURES_DIR = Path(os.environ.get('SLEEPER_FIXTURES', CACHE_DIR / 'fixtures'))
+# sqlite or none; shares fetched payloads between workers on one host
+SHARED_CACHE_BACKEND = os.environ.get('SLEEPER_SHARED_CACHE', 'sqlite')
+SHARED_CACHE_BYTES = 512 * 1024 * 1024
+SHARED_CACHE_LEASE = 30  # seconds one worker may hold a key while fetching it
 
 
 class Style():
@@ -28,6 +69,612 @@ class Style():
         return '; '.join(f'{k.replace("_", "-")}: {v}' for k, v in styles.items()) + ';'
 
 
+class FetchError(Exception):
+    def __init__(self, source: str, error: Exception):
+        # Both in args, so the error unpickles in the parent of a batch worker
+        super().__init__(source, error)
+        self.source = source
+        self.error = error
+
+    def __str__(self) -> str:
+        return f"Failed to fetch {self.source}: {self.error}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: dict[str, dict] = {}
+        self.caches: dict[str, dict] = {}
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            t = self.timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            t['count'] += 1
+            t['total'] += seconds
+            t['max'] = max(t['max'], seconds)
+
+    def count(self, name: str, key: str):
+        with self._lock:
+            c = self.caches.setdefault(name, {'calls': 0, 'misses': 0})
+            c[key] = c.get(key, 0) + 1
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable:
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            timings = {name: dict(t, mean=t['total'] / t['count'])
+                       for name, t in self.timings.items()}
+            caches = {name: dict(c, hits=c['calls'] - c['misses'],
+                                 hit_rate=(c['calls'] - c['misses']) / c['calls'] if c['calls'] else None)
+                      for name, c in self.caches.items()}
+        return {'timings': timings, 'caches': caches}
+
+    def dump(self, path: str):
+        # A temp file per call, so concurrent sessions never replace each other's
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix=f"{os.path.basename(path)}.", suffix='.tmp',
+                                         delete=False) as f:
+            json.dump(dict(self.snapshot(), dumped_at=time.time()), f)
+        os.replace(f.name, path)
+
+    def reset(self):
+        with self._lock:
+            self.timings.clear()
+            self.caches.clear()
+
+
+@st.cache_resource
+def shared_metrics() -> Metrics:
+    # One registry per process; a module-level one would restart on every rerun
+    return Metrics()
+
+
+METRICS = shared_metrics()
+
+
+class SqliteCache:
+    MISSING = object()
+
+    def __init__(self, path: Path, max_bytes: int = SHARED_CACHE_BYTES,
+                 lease: int = SHARED_CACHE_LEASE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lease = lease
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute('PRAGMA journal_mode=WAL')
+            with db:
+                db.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, '
+                           'value BLOB, size INTEGER, expires REAL, accessed REAL)')
+                db.execute('CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, until REAL)')
+            self._local.db = db
+        return db
+
+    def get(self, key: str):
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute('SELECT value FROM entries WHERE key = ? AND '
+                             '(expires IS NULL OR expires > ?)', (key, now)).fetchone()
+            if row is None:
+                return self.MISSING
+            db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._connect() as db:
+            db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                       (key, blob, len(blob), now + ttl if ttl else None, now))
+            self._evict(db, now)
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        db.execute('DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evict = []
+        for key, size in db.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            evict.append((key,))
+            total -= size
+        db.executemany('DELETE FROM entries WHERE key = ?', evict)
+
+    def _acquire(self, key: str) -> bool:
+        now = time.time()
+        with self._connect() as db:
+            cursor = db.execute(
+                'INSERT INTO leases VALUES (?, ?) ON CONFLICT(key) DO UPDATE '
+                'SET until = excluded.until WHERE leases.until <= ?', (key, now + self.lease, now))
+            return cursor.rowcount == 1
+
+    def _release(self, key: str):
+        with self._connect() as db:
+            db.execute('DELETE FROM leases WHERE key = ?', (key,))
+
+    def get_or_compute(self, key: str, compute: Callable, ttl: Optional[float] = None):
+        deadline = time.time() + self.lease
+        while True:
+            value = self.get(key)
+            if value is not self.MISSING:
+                return value
+            # The lease holder fetches while the others wait for its result, taking
+            # over as soon as the lease is released without one (the holder failed)
+            if self._acquire(key):
+                try:
+                    value = compute()
+                    self.set(key, value, ttl)
+                    return value
+                finally:
+                    self._release(key)
+            if time.time() >= deadline:
+                return compute()
+            time.sleep(0.1)
+
+
+SHARED_CACHE = SqliteCache(CACHE_DIR / 'cache.sqlite') if SHARED_CACHE_BACKEND == 'sqlite' else None
+
+
+class CachedFunction:
+    def __init__(self, name: str, cached: Callable):
+        self.name = name
+        self.cached = cached
+
+    def __call__(self, *args, **kwargs):
+        METRICS.count(self.name, 'calls')
+        return self.cached(*args, **kwargs)
+
+    def clear(self, *args, **kwargs):
+        return self.cached.clear(*args, **kwargs)
+
+
+def cache_data(shared: bool = False, **kwargs) -> Callable:
+    # st.cache_data that counts calls, and misses (body runs) with their wall time.
+    # Shared functions look in SHARED_CACHE before running their body.
+    def decorator(fn: Callable) -> CachedFunction:
+        name = fn.__qualname__
+        signature = inspect.signature(fn)
+        version = hashlib.sha1(fn.__code__.co_code).hexdigest()[:8]
+
+        def shared_key(args, kw) -> tuple[str, Optional[float]]:
+            bound = signature.bind(*args, **kw)
+            bound.apply_defaults()
+            hashed = [(k, v) for k, v in bound.arguments.items() if not k.startswith('_')]
+            # Values are pickled against their defining module: the app runs as __main__
+            # and batch.py imports streamlit_app, so they must not read each other's entries
+            key = f"{fn.__module__}:{name}:{version}:{hashlib.sha1(repr(hashed).encode()).hexdigest()}"
+            # Bucketed loaders take their TTL as an argument
+            return key, bound.arguments.get('ttl', kwargs.get('ttl'))
+
+        def compute(args, kw):
+            METRICS.count(name, 'shared_misses')
+            return fn(*args, **kw)
+
+        @functools.wraps(fn)
+        def miss(*args, **kw):
+            METRICS.count(name, 'misses')
+            with METRICS.timer(name):
+                if shared and SHARED_CACHE is not None:
+                    key, ttl = shared_key(args, kw)
+                    return SHARED_CACHE.get_or_compute(key, lambda: compute(args, kw), ttl)
+                return fn(*args, **kw)
+        return CachedFunction(name, st.cache_data(**kwargs)(miss))
+    return decorator
+
+
+class Http:
+    def __init__(self, retries: int = HTTP_RETRIES, timeout: tuple = HTTP_TIMEOUT,
+                 pool_size: int = FETCH_WORKERS * 2, server: Optional[str] = None,
+                 max_validated_bytes: int = HTTP_VALIDATED_BYTES):
+        self.timeout = timeout
+        self.server = server
+        self.max_validated_bytes = max_validated_bytes
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, backoff_jitter=0.5,
+                      status_forcelist=[429, 500, 502, 503, 504], allowed_methods=['GET'])
+        adapter = HTTPAdapter(pool_connections=pool_size,
+                              pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Least recently used first: url -> (validators, payload, body size)
+        self._validated: OrderedDict[str, tuple[dict, object, int]] = OrderedDict()
+        self._validated_bytes = 0
+        self._lock = threading.Lock()
+
+    def get_json(self, url: str):
+        if self.server:
+            # The stand-in server takes the upstream url minus its scheme as the path
+            url = f"{self.server.rstrip('/')}/{url.split('://', 1)[1]}"
+        with self._lock:
+            cached = self._validated.get(url)
+            if cached:
+                self._validated.move_to_end(url)
+        headers = cached[0] if cached else {}
+        resp = self.session.get(url, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and cached:
+            return cached[1]
+        resp.raise_for_status()
+        data = resp.json()
+        # Remember validators so an unchanged payload costs a 304 next time
+        validators = {header: resp.headers[source] for header, source in [
+            ('If-None-Match', 'ETag'), ('If-Modified-Since', 'Last-Modified')]
+            if resp.headers.get(source)}
+        size = len(resp.content) if validators else 0
+        with self._lock:
+            _, _, previous = self._validated.pop(url, (None, None, 0))
+            self._validated_bytes -= previous
+            # Bodies too large to be worth holding on to are refetched in full
+            if validators and size <= self.max_validated_bytes:
+                self._validated[url] = (validators, data, size)
+                self._validated_bytes += size
+                while self._validated_bytes > self.max_validated_bytes:
+                    _, (_, _, evicted) = self._validated.popitem(last=False)
+                    self._validated_bytes -= evicted
+        return data
+
+
+@dataclass
+class Fixtures:
+    path: Path = field(default_factory=lambda: FIXTURES_DIR)
+
+    def _dir(self, url: str) -> Path:
+        return self.path / hashlib.sha1(url.encode()).hexdigest()
+
+    def snapshots(self, url: str) -> list[Path]:
+        return sorted(self._dir(url).glob('*.json'))
+
+    def save(self, url: str, data, at: Optional[float] = None):
+        snapshots = self.snapshots(url)
+        if snapshots and json.loads(snapshots[-1].read_text())['data'] == data:
+            return
+        at = time.time() if at is None else at
+        path = self._dir(url) / f"{at:017.3f}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'url': url, 'recorded_at': at, 'data': data}))
+        os.replace(tmp, path)
+
+    def load(self, url: str, at: Optional[float] = None):
+        snapshots = self.snapshots(url)
+        if not snapshots:
+            raise FileNotFoundError(f"No fixture recorded for {url}")
+        snapshot = snapshots[-1]
+        if at is not None:
+            snapshot = next((p for p in reversed(snapshots)
+                             if float(p.stem) <= at), snapshots[0])
+        return json.loads(snapshot.read_text())['data']
+
+    @property
+    def recorded_from(self) -> Optional[float]:
+        starts = [float(p.stem) for p in self.path.glob('*/*.json')]
+        return min(starts) if starts else None
+
+
+class RecordingHttp(Http):
+    def __init__(self, fixtures: Fixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+
+    def get_json(self, url: str):
+        data = super().get_json(url)
+        self.fixtures.save(url, data)
+        return data
+
+
+class ReplayHttp(Http):
+    def __init__(self, fixtures: Fixtures, speed: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures
+        self.speed = speed
+        self.started_at = time.time()
+
+    @property
+    def clock(self) -> Optional[float]:
+        # Without a speed, always serve the latest snapshot so replays are deterministic
+        recorded_from = self.fixtures.recorded_from
+        if self.speed is None or recorded_from is None:
+            return None
+        return recorded_from + (time.time() - self.started_at) * self.speed
+
+    def get_json(self, url: str):
+        return self.fixtures.load(url, at=self.clock)
+
+
+def http_from_env() -> Http:
+    if SOURCE == 'record':
+        return RecordingHttp(Fixtures())
+    if SOURCE == 'replay':
+        speed = os.environ.get('SLEEPER_REPLAY_SPEED')
+        return ReplayHttp(Fixtures(), speed=float(speed) if speed else None)
+    if SOURCE == 'server':
+        return Http(server=os.environ.get('SLEEPER_SERVER_URL', 'http://127.0.0.1:8765'))
+    return Http()
+
+
+@st.cache_resource
+def shared_http() -> Http:
+    # Streamlit re-executes this module on every rerun; the pooled connections
+    # and ETag validators have to outlive that
+    return http_from_env()
+
+
+HTTP = shared_http()
+
+
+class CachePolicy:
+    # (live or about to kick off, idle) TTLs per source
+    TTLS = {
+        'game_statuses': (LIVE_TTL, IDLE_TTL),
+        'stats': (LIVE_TTL, IDLE_TTL),
+        'projections': (STATS_TTL, METADATA_TTL),
+    }
+    # Until a week's game statuses have been seen
+    DEFAULTS = {
+        'game_statuses': STATS_TTL,
+        'stats': STATS_TTL,
+        'projections': METADATA_TTL,
+    }
+
+    def __init__(self):
+        self._statuses: dict[tuple, pd.DataFrame] = {}
+        self._finished: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, season: int, week: int, statuses: pd.DataFrame, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        with self._lock:
+            previous = self._statuses.get((season, week))
+            self._statuses[(season, week)] = statuses
+            if previous is None or previous.empty or statuses.empty:
+                return
+            was_playing = Data.game_states(previous) == 'in'
+            states = Data.game_states(statuses).reindex(was_playing[was_playing].index)
+            if (states == 'post').any():
+                self._finished[(season, week)] = now
+
+    def is_live(self, season: int, week: int, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        with self._lock:
+            statuses = self._statuses.get((season, week))
+            finished = self._finished.get((season, week), -math.inf)
+        if now - finished < FINAL_GRACE:
+            return True
+        return statuses is not None and bool((Data.game_states(statuses) == 'in').any())
+
+    def ttl(self, source: str, season: int, week: int, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            statuses = self._statuses.get((season, week))
+        if statuses is None or statuses.empty:
+            return self.DEFAULTS[source]
+        live, idle = self.TTLS[source]
+        if self.is_live(season, week, now):
+            return live
+        states = Data.game_states(statuses)
+        kickoffs = pd.to_datetime(statuses.loc[states == 'pre', 'game_time'], utc=True).dropna()
+        if kickoffs.empty:
+            return idle
+        until = kickoffs.min().timestamp() - now
+        if until <= PREGAME:
+            return live
+        desired = min(idle, until - PREGAME)
+        return max([ttl for ttl in TTL_STEPS if ttl <= desired], default=live)
+
+    def bucket(self, source: str, season: int, week: int) -> tuple[int, int]:
+        # Buckets line up with the wall clock, so every process agrees when they roll over
+        ttl = self.ttl(source, season, week)
+        return ttl, int(time.time() // ttl)
+
+
+@st.cache_resource
+def shared_cache_policy() -> CachePolicy:
+    # Outlives reruns, so each statuses fetch is bucketed by the one before it
+    return CachePolicy()
+
+
+CACHE_POLICY = shared_cache_policy()
+
+
+class SleeperLeague:
+    def __init__(self, league_id: int):
+        self.league_id = league_id
+
+    def _get(self, path: str = ''):
+        return HTTP.get_json(f"{Data.SLEEPER_URL}/league/{self.league_id}{path}")
+
+    def get_league(self) -> dict:
+        return self._get()
+
+    def get_rosters(self) -> list:
+        return self._get('/rosters')
+
+    def get_users(self) -> list:
+        return self._get('/users')
+
+    def get_matchups(self, week: int) -> list:
+        return self._get(f'/matchups/{week}')
+
+    def get_playoff_winners_bracket(self) -> list:
+        return self._get('/winners_bracket')
+
+    def get_playoff_losers_bracket(self) -> list:
+        return self._get('/losers_bracket')
+
+
+@dataclass
+class PlayerStore:
+    path: Path = field(default_factory=lambda: CACHE_DIR / 'players.parquet')
+    max_age: int = METADATA_TTL
+
+    COLUMNS = ['team', 'first_name', 'last_name', 'position', 'injury_status']
+    CATEGORIES = ['team', 'position', 'injury_status']
+    NAMES = ['first_name', 'last_name']
+
+    @property
+    def fetched_at(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    @property
+    def is_fresh(self) -> bool:
+        fetched_at = self.fetched_at
+        return fetched_at is not None and time.time() - fetched_at < self.max_age
+
+    def load(self) -> pd.DataFrame:
+        if self.is_fresh:
+            return self.compact(pd.read_parquet(self.path))
+        return self.refresh()
+
+    def refresh(self) -> pd.DataFrame:
+        df = self.compact(self.download())
+        self.save(df)
+        return df
+
+    @classmethod
+    def compact(cls, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.astype({col: 'category' for col in cls.CATEGORIES})
+        # Interned names share one object per distinct name, in memory and in pickles.
+        # The object dtype is explicit because pandas 3 would copy them into its str dtype
+        for col in cls.NAMES:
+            df[col] = pd.Series([sys.intern(v) if isinstance(v, str) else v for v in df[col]],
+                                index=df.index, dtype=object)
+        return df
+
+    def save(self, df: pd.DataFrame):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file per call, so replicas sharing the cache dir never clobber each other's
+        with tempfile.NamedTemporaryFile(dir=self.path.parent, prefix=f"{self.path.name}.",
+                                         suffix='.tmp', delete=False) as f:
+            tmp = Path(f.name)
+        try:
+            df.to_parquet(tmp)
+            os.replace(tmp, self.path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def download(cls) -> pd.DataFrame:
+        players = HTTP.get_json(f"{Data.SLEEPER_URL}/players/nfl")
+        return pd.DataFrame.from_dict({
+            player_id: {col: player.get(col) for col in cls.COLUMNS}
+            for player_id, player in players.items()
+        }, orient='index', columns=cls.COLUMNS)
+
+
+class StatStore:
+    # Player-indexed CSR matrix of weekly stats: row i holds the non-zero stats of
+    # players[i] as keys[indices[indptr[i]:indptr[i + 1]]] and the matching values
+    def __init__(self, players: pd.Index, keys: pd.Index, indptr: np.ndarray,
+                 indices: np.ndarray, values: np.ndarray):
+        self.players = players
+        self.keys = keys
+        self.indptr = indptr
+        self.indices = indices
+        self.values = values
+        self._version: Optional[str] = None
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> 'StatStore':
+        codes: dict[str, int] = {}
+        indptr, indices, values = [0], [], []
+        for stats in payload.values():
+            for key, value in (stats or {}).items():
+                if isinstance(value, (int, float, np.number)) and value == value and value != 0:
+                    indices.append(codes.setdefault(key, len(codes)))
+                    values.append(value)
+            indptr.append(len(indices))
+        return cls(pd.Index(list(payload)), pd.Index(list(codes), dtype=object),
+                   np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int32),
+                   np.array(values, dtype=np.float64))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'StatStore':
+        # Stat keys by player columns, as pd.DataFrame(payload) lays them out
+        return cls.from_payload({player_id: stats.dropna().to_dict()
+                                 for player_id, stats in df.items()})
+
+    @classmethod
+    def coerce(cls, stats) -> 'StatStore':
+        # Not isinstance(stats, cls): each Streamlit rerun redefines this class, while
+        # live sessions keep stores built by an earlier run
+        return cls.from_frame(stats) if isinstance(stats, pd.DataFrame) else stats
+
+    @property
+    def empty(self) -> bool:
+        return len(self.values) == 0
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            digest = hashlib.sha1()
+            digest.update(pd.util.hash_pandas_object(self.players.to_series()).to_numpy())
+            digest.update(pd.util.hash_pandas_object(self.keys.to_series()).to_numpy())
+            for array in (self.indptr, self.indices, self.values):
+                digest.update(array.tobytes())
+            self._version = digest.hexdigest()
+        return self._version
+
+    def row(self, player_id) -> dict:
+        if player_id not in self.players:
+            return {}
+        i = self.players.get_loc(player_id)
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return dict(zip(self.keys[self.indices[start:end]], self.values[start:end].tolist()))
+
+    def _rows(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self.players)), np.diff(self.indptr))
+
+    def entries(self) -> pd.Series:
+        rows = self._rows()
+        return pd.Series(self.values, index=pd.MultiIndex.from_arrays(
+            [self.players[rows], self.keys[self.indices]]))
+
+    def changed(self, previous: 'StatStore') -> pd.Index:
+        if previous.version == self.version:
+            return pd.Index([])
+        new, old = self.entries().align(previous.entries(), fill_value=0)
+        return new.index[(new != old).to_numpy()].get_level_values(0).unique()
+
+    def prune(self, keys) -> 'StatStore':
+        keep = self.keys.isin(list(keys))
+        mask = keep[self.indices]
+        codes = np.cumsum(keep) - 1
+        rows = self._rows()
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows[mask], minlength=len(self.players)))])
+        return StatStore(self.players, self.keys[keep], indptr.astype(np.int64),
+                         codes[self.indices[mask]].astype(np.int32), self.values[mask])
+
+    def score(self, scoring: dict) -> pd.Series:
+        weights = pd.Series(scoring, dtype=float).reindex(self.keys).fillna(0).to_numpy()
+        points = np.bincount(self._rows(), weights=self.values * weights[self.indices],
+                             minlength=len(self.players))
+        return pd.Series(points, index=self.players)
+
+
 @dataclass
 class Data:
     league_id: InitVar[int]
@@ -36,61 +683,153 @@ class Data:
     matchups: pd.DataFrame = None
     rosters: pd.DataFrame = None
     players: pd.DataFrame = None
-    projections: pd.DataFrame = None
-    stats: pd.DataFrame = None
-    league: sleeper.League = None
+    projections: StatStore = None
+    stats: StatStore = None
+    league: SleeperLeague = None
+    _settings: Optional[dict] = field(default=None, init=False, repr=False)
+    _refreshed_at: float = field(default_factory=time.time, init=False, repr=False)
+    _snapshot: Optional['Snapshot'] = field(default=None, init=False, repr=False)
 
     TEAM_MAPPINGS = {
         'WSH': 'WAS',
     }
+    SLEEPER_URL = "https://api.sleeper.app/v1"
 
+    @METRICS.timed('Data')
     def __post_init__(self, league_id: int, context: 'Context') -> 'Data':
-        if self.game_statuses is None:
-            self.game_statuses = self.get_game_statuses(
-                context.season, context.week)
-        if self.matchups is None:
-            self.matchups = self.get_matchups(league_id, context.week)
-        if self.rosters is None:
-            self.rosters = self.get_rosters(league_id)
-        if self.players is None:
-            self.players = self.get_players()
-        if self.projections is None:
-            self.projections = self.get_projections(
-                context.season, context.week)
-        if self.stats is None:
-            self.stats = self.get_stats(context.season, context.week)
-        if self.league is None:
-            self.league = self.get_league(league_id)
+        fetchers = {
+            'game_statuses': lambda: self.get_game_statuses(context.season, context.week),
+            'matchups': lambda: self._fetch_matchups(league_id, context.week),
+            'rosters': lambda: self.get_rosters(league_id, self._league(league_id)),
+            'players': lambda: self.get_players(),
+            'projections': lambda: self.get_projections(context.season, context.week),
+            'stats': lambda: self.get_stats(context.season, context.week),
+            'league': lambda: self.get_league(league_id),
+        }
+        pending = {name: fetch for name, fetch in fetchers.items()
+                   if getattr(self, name) is None}
+        for name, value in self.fetch(pending).items():
+            setattr(self, name, value)
+
+    def refresh_live(self, season: int, week: int):
+        # The fragment reruns every LIVE_TTL; gating on exactly that would skip every
+        # tick that lands a hair early and only refresh every other minute
+        if time.time() - self._refreshed_at < LIVE_TTL - LIVE_SLACK:
+            return
+        # Statuses are always refetched so a kickoff after the session was pinned
+        # is noticed; stats only while a game is or just was being played
+        was_live = self.games_in_progress
+        self.game_statuses = self.get_game_statuses(season, week)
+        if was_live or self.games_in_progress or CACHE_POLICY.is_live(season, week):
+            self.stats = self.get_stats(season, week)
+        self._refreshed_at = time.time()
+
+    @property
+    def games_in_progress(self) -> bool:
+        if self.game_statuses is None or self.game_statuses.empty:
+            return False
+        return bool((self.game_states(self.game_statuses) == 'in').any())
+
+    @staticmethod
+    def pct_played(df: pd.DataFrame) -> pd.Series:
+        pct_played = ((df['quarter'] * 15 - df['clock'] / 60) / 60).clip(0, 1)
+        if 'state' not in df:
+            return pct_played
+        # The clock alone reads overtime or a review at 0:00 in the 4th as final
+        return pct_played.mask(df['state'] == 'in', pct_played.clip(upper=np.nextafter(1, 0))) \
+            .mask(df['state'] == 'post', 1)
+
+    @staticmethod
+    def game_states(df: pd.DataFrame) -> pd.Series:
+        # ESPN's pre, in or post; statuses without it are judged by the clock
+        if 'state' in df:
+            return df['state']
+        pct_played = Data.pct_played(df)
+        return pd.Series(np.select([pct_played <= 0, pct_played >= 1], ['pre', 'post'], 'in'),
+                         index=df.index)
 
     @staticmethod
-    @st.cache_data(ttl=METADATA_TTL)
-    def get_league(league_id: int) -> sleeper.League:
-        return sleeper.League(league_id)
+    def fetch(fetchers: dict[str, Callable], max_workers: int = FETCH_WORKERS) -> dict:
+        if not fetchers:
+            return {}
+        ctx = get_script_run_ctx(suppress_warning=True)
+
+        def run(name: str, fetch: Callable):
+            # Let cached fetchers running on pool threads see the script run
+            add_script_run_ctx(threading.current_thread(), ctx)
+            with METRICS.timer(f"fetch.{name}"):
+                return fetch()
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(fetchers))) as pool:
+            futures = {name: pool.submit(run, name, fetch)
+                       for name, fetch in fetchers.items()}
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                raise FetchError(name, e) from e
+        return results
+
+    @staticmethod
+    @cache_data(ttl=METADATA_TTL)
+    def get_league(league_id: int) -> SleeperLeague:
+        return SleeperLeague(league_id)
+
+    def _league(self, league_id: int) -> SleeperLeague:
+        return self.league if self.league is not None else self.get_league(league_id)
+
+    def _fetch_matchups(self, league_id: int, week: int) -> pd.DataFrame:
+        league = self._league(league_id)
+        # The one league snapshot of this refresh, shared with settings and scoring
+        if self._settings is None:
+            self._settings = league.get_league()
+        playoff_week_start = self._settings['settings']['playoff_week_start']
+        return self.get_matchups(league_id, week, playoff_week_start, league)
+
+    @property
+    def settings(self) -> dict:
+        if self._settings is None:
+            self._settings = self.league.get_league()
+        return self._settings
+
+    def invalidate_settings(self):
+        league_id = self.league.league_id
+        Data.get_league.clear(league_id)
+        self.league = self.get_league(league_id)
+        self._settings = None
 
     @property
     def scoring(self) -> dict:
-        return self.league.get_league()['scoring_settings']
+        return self.settings['scoring_settings']
 
     @property
     def positions(self) -> list[str]:
-        return self.league.get_league()['roster_positions']
+        return self.settings['roster_positions']
 
     @staticmethod
-    @st.cache_data(ttl=STATS_TTL)
     def get_game_statuses(season: int, week: int) -> pd.DataFrame:
+        df = Data._get_game_statuses(
+            season, week, *CACHE_POLICY.bucket('game_statuses', season, week))
+        CACHE_POLICY.observe(season, week, df)
+        return df
+
+    @staticmethod
+    @cache_data(shared=True, ttl=IDLE_TTL, max_entries=64)
+    def _get_game_statuses(season: int, week: int, ttl: int, bucket: int) -> pd.DataFrame:
         url = f"https://partners.api.espn.com/v2/sports/football/nfl/events?limit=50&season={season}&week={week}"
-        resp = requests.get(url)
-        data = resp.json()
+        data = HTTP.get_json(url)
         competitions = [e['competitions'][0] for e in data['events']]
         df = pd.json_normalize(competitions)
         df = df.explode('competitors')
-        df = df[['id', 'competitors', 'status.period',
-                 'status.clock', 'status.type.shortDetail', 'time.value']]
+        df = df[['id', 'competitors', 'status.period', 'status.clock', 'status.type.shortDetail',
+                 'status.type.state', 'status.type.completed', 'time.value']]
         df = pd.json_normalize(df.to_dict(orient='records'))
         df.rename(columns={
             'competitors.team.abbreviation': 'team',
             'competitors.score.displayValue': 'score',
             'status.type.shortDetail': 'game_status',
+            'status.type.state': 'state',
             'status.period': 'quarter',
             'status.clock': 'clock',
             'time.value': 'game_time',
@@ -98,20 +837,22 @@ class Data:
         }, inplace=True)
         df['home'] = df['competitors.homeAway'] == 'home'
         df['team'] = df['team'].replace(Data.TEAM_MAPPINGS)
-        df = df[['team', 'score', 'quarter', 'clock',
+        df.loc[df['status.type.completed'].fillna(False).astype(bool), 'state'] = 'post'
+        df = df[['team', 'score', 'quarter', 'clock', 'state',
                  'game_status', 'home', 'game_id', 'game_time']]
         df = df.merge(df, on='game_id', suffixes=(
             '', '_opponent')).query('team != team_opponent')
         df.set_index('team', inplace=True)
         df.rename(columns={'team_opponent': 'opponent',
                   'score_opponent': 'opponent_score'}, inplace=True)
-        return df[['quarter', 'clock', 'game_status', 'home', 'opponent', 'score', 'opponent_score', 'game_time']]
+        return df[['quarter', 'clock', 'state', 'game_status', 'home', 'opponent', 'score', 'opponent_score', 'game_time']]
 
     @staticmethod
-    @st.cache_data(ttl=METADATA_TTL)
-    def get_matchups(league_id: int, week: int) -> pd.DataFrame:
-        league = sleeper.League(league_id)
-        last_regular_week = league.get_league()['settings']['playoff_week_start'] - 1
+    @cache_data(shared=True, ttl=METADATA_TTL)
+    def get_matchups(league_id: int, week: int, playoff_week_start: int,
+                     _league: SleeperLeague) -> pd.DataFrame:
+        league = _league
+        last_regular_week = playoff_week_start - 1
         df = pd.DataFrame(league.get_matchups(week))
         if df.empty:
             return df
@@ -137,9 +878,9 @@ class Data:
         return df
 
     @staticmethod
-    @st.cache_data(ttl=METADATA_TTL)
-    def get_rosters(league_id: int) -> pd.DataFrame:
-        league = sleeper.League(league_id)
+    @cache_data(shared=True, ttl=METADATA_TTL)
+    def get_rosters(league_id: int, _league: SleeperLeague) -> pd.DataFrame:
+        league = _league
         df = pd.json_normalize(league.get_rosters()).set_index('roster_id')
         df['record'] = df['settings.wins'].astype(
             str) + '-' + df['settings.losses'].astype(str)
@@ -167,20 +908,64 @@ class Data:
         return df[['avatar', 'username', 'name', 'record', 'rank']]
 
     @staticmethod
-    @st.cache_data(ttl=METADATA_TTL)
+    @cache_data(ttl=METADATA_TTL)
     def get_players() -> pd.DataFrame:
-        return pd.DataFrame.from_dict(
-            sleeper.Players().get_all_players("nfl"), orient='index')
+        return PlayerStore().load()
 
     @staticmethod
-    @st.cache_data(ttl=METADATA_TTL)
-    def get_projections(season: int, week: int) -> pd.DataFrame:
-        return pd.DataFrame(sleeper.Stats().get_week_projections("regular", season, week))
+    def refresh_players() -> pd.DataFrame:
+        df = PlayerStore().refresh()
+        Data.get_players.clear()
+        return df
 
     @staticmethod
-    @st.cache_data(ttl=STATS_TTL)
-    def get_stats(season: int, week: int) -> pd.DataFrame:
-        return pd.DataFrame(sleeper.Stats().get_week_stats("regular", season, week))
+    def get_projections(season: int, week: int) -> StatStore:
+        return Data._get_projections(
+            season, week, *CACHE_POLICY.bucket('projections', season, week))
+
+    @staticmethod
+    @cache_data(shared=True, ttl=IDLE_TTL, max_entries=64)
+    def _get_projections(season: int, week: int, ttl: int, bucket: int) -> StatStore:
+        return StatStore.from_payload(HTTP.get_json(
+            f"{Data.SLEEPER_URL}/projections/nfl/regular/{season}/{week}"))
+
+    @staticmethod
+    def get_stats(season: int, week: int) -> StatStore:
+        return Data._get_stats(season, week, *CACHE_POLICY.bucket('stats', season, week))
+
+    @staticmethod
+    @cache_data(shared=True, ttl=IDLE_TTL, max_entries=64)
+    def _get_stats(season: int, week: int, ttl: int, bucket: int) -> StatStore:
+        return StatStore.from_payload(HTTP.get_json(
+            f"{Data.SLEEPER_URL}/stats/nfl/regular/{season}/{week}"))
+
+    # Completed weeks never change, so they are cached on disk without a TTL
+    @staticmethod
+    @cache_data(persist='disk')
+    def get_final_matchups(league_id: int, week: int, playoff_week_start: int,
+                           _league: SleeperLeague) -> pd.DataFrame:
+        return Data.get_matchups(league_id, week, playoff_week_start, _league)
+
+    @staticmethod
+    @cache_data(persist='disk')
+    def get_final_projections(season: int, week: int) -> StatStore:
+        return Data.get_projections(season, week)
+
+    @staticmethod
+    @cache_data(persist='disk')
+    def get_final_stats(season: int, week: int) -> StatStore:
+        return Data.get_stats(season, week)
+
+    @staticmethod
+    def version(df: pd.DataFrame) -> str:
+        if not isinstance(df, pd.DataFrame):
+            return df.version
+        if 'version' in df.attrs:
+            return df.attrs['version']
+        digest = hashlib.sha1()
+        digest.update(pd.util.hash_pandas_object(df.columns.to_series()).to_numpy())
+        digest.update(pd.util.hash_pandas_object(df).to_numpy())
+        return digest.hexdigest()
 
 
 class Positions(pd.DataFrame):
@@ -196,6 +981,7 @@ class Positions(pd.DataFrame):
         ['BN', 'BN', ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']],
     ]
 
+    @METRICS.timed('Positions')
     def __init__(self, data: Data):
         df = pd.DataFrame(self.MAPPINGS).rename(
             columns={1: 'position', 2: 'eligible'}).set_index(0)
@@ -208,7 +994,84 @@ class Positions(pd.DataFrame):
         super().__init__(df[['position', 'eligible']])
 
 
-@dataclass
+class LineupSolver:
+    def __init__(self, slots: tuple[str, ...], eligible: tuple[tuple[str, ...], ...]):
+        self.slots = slots
+        bench = [spos.startswith('BN') for spos in slots]
+        self.groups = [
+            [1 << i for i, is_bench in enumerate(bench) if not is_bench],
+            [1 << i for i, is_bench in enumerate(bench) if is_bench],
+        ]
+        self.masks: dict[str, int] = {}
+        for i, positions in enumerate(eligible):
+            for position in positions:
+                self.masks[position] = self.masks.get(position, 0) | 1 << i
+
+    @classmethod
+    def for_positions(cls, positions: pd.DataFrame) -> 'LineupSolver':
+        return cls._for_layout(
+            tuple(positions.index), tuple(tuple(e) for e in positions['eligible']))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _for_layout(slots: tuple[str, ...], eligible: tuple[tuple[str, ...], ...]) -> 'LineupSolver':
+        return LineupSolver(slots, eligible)
+
+    def assign(self, positions: Sequence[str], values: Sequence[float]) -> list[Optional[str]]:
+        values = [-math.inf if v is None or v != v else v for v in values]
+        order = sorted(range(len(values)), key=lambda i: -values[i])
+        masks = [self.masks.get(p, 0) for p in positions]
+        assignment: list[Optional[str]] = [None] * len(values)
+        for group in self.groups:
+            group_mask = sum(group)
+            candidates = [i for i in order
+                          if assignment[i] is None and masks[i] & group_mask]
+            # Greedy over a transversal matroid: taking players by value whenever
+            # they still fit yields the maximum-value set of players to start
+            owner: dict[int, int] = {}
+            chosen = [i for i in candidates
+                      if self._augment(i, masks, group_mask, owner, [0])]
+            # Then fill slots in layout order with the best chosen player that
+            # still leaves a complete assignment for the remaining slots
+            for n, slot in enumerate(group):
+                later = sum(group[n + 1:])
+                for i in chosen:
+                    if masks[i] & slot and self._fits([j for j in chosen if j != i], masks, later):
+                        assignment[i] = self.slots[slot.bit_length() - 1]
+                        chosen.remove(i)
+                        break
+        return assignment
+
+    def assign_groups(self, positions: Sequence[str], values: Sequence[float],
+                      groups: Iterable[Sequence[int]]) -> list[Optional[str]]:
+        assignment: list[Optional[str]] = [None] * len(values)
+        for rows in groups:
+            solved = self.assign([positions[i] for i in rows], [values[i] for i in rows])
+            for i, spos in zip(rows, solved):
+                assignment[i] = spos
+        return assignment
+
+    @classmethod
+    def _fits(cls, players: list[int], masks: list[int], slot_mask: int) -> bool:
+        owner: dict[int, int] = {}
+        return all(cls._augment(i, masks, slot_mask, owner, [0]) for i in players)
+
+    @classmethod
+    def _augment(cls, player: int, masks: list[int], slot_mask: int,
+                 owner: dict[int, int], visited: list[int]) -> bool:
+        bits = masks[player] & slot_mask & ~visited[0]
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            visited[0] |= bit
+            other = owner.get(bit)
+            if other is None or cls._augment(other, masks, slot_mask, owner, visited):
+                owner[bit] = player
+                return True
+        return False
+
+
+@dataclass(slots=True)
 class Player:
     first_name: str = field(default_factory=str)
     last_name: str = field(default_factory=str)
@@ -228,6 +1091,12 @@ class Player:
     game_time: Optional[str] = field(default=None)
     score: Optional[int] = field(default=None)
     opponent_score: Optional[int] = field(default=None)
+    status_text: Optional[str] = field(default=None)
+    points_text: Optional[str] = field(default=None)
+    projection_text: Optional[str] = field(default=None)
+    info_text: Optional[str] = field(default=None)
+
+    DISPLAY_COLUMNS = ['status_text', 'points_text', 'projection_text', 'info_text']
 
     @property
     def name(self) -> str:
@@ -236,6 +1105,8 @@ class Player:
         return "N/A"
 
     def get_status(self) -> str:
+        if self.status_text is not None:
+            return self.status_text
         vs = "vs" if self.home else "@"
         if self.bye:
             return "Bye"
@@ -255,9 +1126,13 @@ class Player:
         return self.pct_played == 1
 
     def get_points(self) -> str:
+        if self.points_text is not None:
+            return self.points_text
         return "-" if self.points == 0 else f"{self.points:.2f}"
 
     def get_projection(self) -> str:
+        if self.projection_text is not None:
+            return self.projection_text
         if self.projection == 0:
             return "-"
         elif self.is_final:
@@ -275,32 +1150,205 @@ class Player:
 
     @property
     def player_info(self) -> str:
+        if self.info_text is not None:
+            return self.info_text
         info = f"{self.position} - {self.team}"
         if self.injury_status:
             info += f" ({self.INJURY_STATUS_MAP.get(self.injury_status, self.injury_status)})"
         return info
 
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> list['Player']:
+        # Each column becomes plain Python values in one go, then records are
+        # built positionally, with defaults for columns the frame doesn't have
+        columns = []
+        for f in fields(cls):
+            if f.name in df.columns:
+                columns.append(df[f.name].tolist())
+            else:
+                default = f.default if f.default is not MISSING else f.default_factory()
+                columns.append([default] * len(df))
+        return [cls(*values) for values in zip(*columns)]
+
+    @classmethod
+    def display(cls, df: pd.DataFrame, timezone: Optional[str]) -> pd.DataFrame:
+        # The same strings as the per-player getters, formatted for the whole frame at once
+        if df.empty:
+            return pd.DataFrame(index=df.index, columns=cls.DISPLAY_COLUMNS, dtype=object)
+        vs = np.where(df['home'].fillna(False).astype(bool), " vs ", " @ ")
+        opponent = vs + df['opponent'].astype(str)
+        kickoff = pd.to_datetime(df['game_time'], utc=True, format='ISO8601').dt.tz_convert(
+            timezone).dt.strftime('%a %-I:%M %p')
+        scoreline = (df['game_status'].astype(str) + " " + df['score'].astype(str) +
+                     "-" + df['opponent_score'].astype(str))
+        has_kickoff = df['game_time'].fillna('').astype(str).str.len() > 0
+        injury = df['injury_status'].fillna('').astype(str)
+        abbreviation = injury.map(cls.INJURY_STATUS_MAP).fillna(injury)
+        return pd.DataFrame({
+            'status_text': np.select(
+                [df['bye'].astype(bool), (df['pct_played'] == 0) & has_kickoff],
+                ["Bye", kickoff + opponent], scoreline + opponent),
+            'points_text': np.where(df['points'] == 0, "-", df['points'].map("{:.2f}".format)),
+            'projection_text': np.select(
+                [df['projection'] == 0, df['pct_played'] == 1],
+                ["-", df['projection'].map("{:.2f}".format)], df['optimistic'].map("{:.2f}".format)),
+            'info_text': (df['position'].astype(str) + " - " + df['team'].astype(str) +
+                          pd.Series(np.where(injury != '', " (" + abbreviation + ")", ""),
+                                    index=df.index)),
+        }, index=df.index)
+
+
+class Lineups(pd.DataFrame):
+    COLUMNS = {
+        'optimistic': 'spos',
+        'points': 'current_position',
+    }
+
+    @METRICS.timed('Lineups')
+    def __init__(self, players: pd.DataFrame, rosters: pd.Series, positions: pd.DataFrame,
+                 previous: Optional['Lineups'] = None, changed: Optional[pd.Index] = None):
+        frames = []
+        if previous is not None:
+            # Only rosters holding a changed player need solving again
+            ids = rosters.explode()
+            affected = ids.index[ids.isin(changed)].unique()
+            frames.append(pd.DataFrame(previous[
+                ~previous.index.get_level_values('roster_id').isin(affected)]))
+            rosters = rosters.loc[affected]
+        if previous is None or not rosters.empty:
+            frames.append(self.solve(players, rosters, positions))
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        df = df.sort_values(by=['roster_id', 'optimistic'], ascending=[True, False])
+        super().__init__(df)
 
-class Roster(pd.DataFrame):
-    def __init__(self, players: pd.DataFrame, positions: pd.DataFrame):
-        df = players.copy()
-        cols = {
-            'optimistic': 'spos',
-            'points': 'current_position',
-        }
-        for by, col in cols.items():
-            df = df.sort_values(by=[by], ascending=False)
-            df[col] = None
-            for spos, eligible in positions.iterrows():
-                starter = df.loc[(df['position'].isin(eligible['eligible'])) & (
-                    df[col].isnull()), col].head(1).index
-                df.loc[starter, col] = spos
+    @classmethod
+    def solve(cls, players: pd.DataFrame, rosters: pd.Series, positions: pd.DataFrame) -> pd.DataFrame:
+        ids = rosters.explode().dropna()
+        ids = ids[ids.isin(players.index)]
+        df = players.loc[ids.to_numpy()]
+        df.index = pd.MultiIndex.from_arrays(
+            [ids.index, ids.to_numpy()], names=['roster_id', players.index.name])
+        solver = LineupSolver.for_positions(positions)
+        for by, col in cls.COLUMNS.items():
+            groups = df.groupby(level='roster_id', sort=False).indices.values()
+            df[col] = solver.assign_groups(
+                df['position'].tolist(), df[by].tolist(), groups)
             df = df[df[col].notnull()]
-        df = df.sort_values(by=['optimistic'], ascending=False)
-        super().__init__(df)
+        return df
+
+    def roster(self, roster_id) -> 'Roster':
+        try:
+            df = self.loc[roster_id]
+        except KeyError:
+            df = self.iloc[:0].droplevel('roster_id')
+        return Roster(df)
+
+
+class Simulation:
+    def __init__(self, lineups: pd.DataFrame, positions: pd.DataFrame,
+                 trials: int = SIM_TRIALS, seed: int = 0):
+        self.trials = trials
+        self.rng = np.random.default_rng(seed)
+        roster_ids = lineups.index.get_level_values('roster_id')
+        self.roster_ids = roster_ids.unique()
+        team = self.roster_ids.get_indexer(roster_ids)
+        points = lineups['points'].fillna(0).to_numpy(dtype=np.float32)
+        remaining = ((1 - lineups['pct_played']) * lineups['projection']).fillna(0).clip(
+            lower=0).to_numpy(dtype=np.float32)
+        position = lineups['position'].to_numpy()
+        # Filling the most restrictive slots first is exact for the nested
+        # dedicated < FLEX < SUPER_FLEX eligibility in Positions.MAPPINGS
+        starters = positions[~positions.index.str.startswith('BN')]
+        counts = starters['eligible'].map(tuple).value_counts(sort=False)
+        groups = sorted(counts.items(), key=lambda c: len(c[0]))
+        self.dedicated = {eligible[0]: count for eligible, count in groups if len(eligible) == 1}
+        self.wide = [(count, eligible) for eligible, count in groups if len(eligible) > 1]
+        # One (team, player) block per position, padded with -inf so every
+        # team has at least one empty place left after its players
+        self.blocks: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for pos in sorted({p for eligible, _ in groups for p in eligible}):
+            rows = position == pos
+            teams = team[rows]
+            slot = pd.Series(teams).groupby(teams).cumcount().to_numpy()
+            width = int(slot.max()) + 2 if len(slot) else 1
+            block_points = np.full((len(self.roster_ids), width), -np.inf, dtype=np.float32)
+            block_remaining = np.zeros((len(self.roster_ids), width), dtype=np.float32)
+            block_points[teams, slot] = points[rows]
+            block_remaining[teams, slot] = remaining[rows]
+            self.blocks[pos] = (block_points, block_remaining)
+
+    def totals(self) -> np.ndarray:
+        chunks = [self._totals(min(SIM_CHUNK, self.trials - start))
+                  for start in range(0, self.trials, SIM_CHUNK)]
+        return np.concatenate(chunks) if chunks else np.zeros((0, len(self.roster_ids)), dtype=np.float32)
+
+    def _totals(self, trials: int) -> np.ndarray:
+        shape = 1 / SIM_CV ** 2
+        totals = np.zeros((trials, len(self.roster_ids)), dtype=np.float32)
+        ranked, heads = {}, {}
+        for pos, (points, remaining) in self.blocks.items():
+            live = remaining > 0
+            samples = np.repeat(points[np.newaxis], trials, axis=0)
+            # Only players with something left to play need a random draw
+            samples[:, live] += self.rng.standard_gamma(
+                shape, size=(trials, int(live.sum())), dtype=np.float32) * (remaining[live] / shape)
+            # One sort per position and trial: dedicated slots take the best few,
+            # and the rest queue up best first for the wider slots
+            samples = np.sort(samples, axis=-1)[..., ::-1]
+            dedicated = self.dedicated.get(pos, 0)
+            top = samples[..., :dedicated]
+            totals += np.where(np.isfinite(top), top, 0).sum(axis=-1)
+            ranked[pos] = samples
+            heads[pos] = np.full((trials, len(self.roster_ids), 1), min(dedicated, samples.shape[-1] - 1))
+        for count, eligible in self.wide:
+            members = [pos for pos in eligible if pos in ranked]
+            for _ in range(count if members else 0):
+                # The best player still waiting at any eligible position takes the slot
+                values = np.stack([np.take_along_axis(ranked[pos], heads[pos], axis=-1)[..., 0]
+                                   for pos in members])
+                best = values.argmax(axis=0)
+                value = np.take_along_axis(values, best[np.newaxis], axis=0)[0]
+                taken = np.isfinite(value)
+                totals += np.where(taken, value, 0)
+                for i, pos in enumerate(members):
+                    heads[pos][..., 0] += (best == i) & taken
+        return totals
+
+    def win_probabilities(self, pairs: list[tuple]) -> list[float]:
+        if not pairs:
+            return []
+        # Teams without players score zero: an index of -1 picks the padding column
+        totals = np.column_stack([self.totals(), np.zeros(self.trials, dtype=np.float32)])
+        team1 = totals[:, self.roster_ids.get_indexer([t1 for t1, _ in pairs])]
+        team2 = totals[:, self.roster_ids.get_indexer([t2 for _, t2 in pairs])]
+        return ((team1 > team2).mean(axis=0) + 0.5 * (team1 == team2).mean(axis=0)).tolist()
+
+    @staticmethod
+    def key(lineups: pd.DataFrame, positions: pd.DataFrame) -> str:
+        digest = hashlib.sha1()
+        digest.update(','.join(positions.index).encode())
+        digest.update(pd.util.hash_pandas_object(
+            lineups[['position', 'points', 'projection', 'pct_played']]).to_numpy())
+        return digest.hexdigest()
+
+    @staticmethod
+    @cache_data(ttl=STATS_TTL, max_entries=64)
+    def cached(key: str, pairs: list[tuple], _lineups: pd.DataFrame,
+               _positions: pd.DataFrame) -> list[float]:
+        return Simulation(_lineups, _positions).win_probabilities(pairs)
+
+
+class Roster(pd.DataFrame):
+    _metadata = ['slots']
+
+    def __init__(self, players: pd.DataFrame, positions: Optional[pd.DataFrame] = None):
+        if positions is not None:
+            players = Lineups(players, pd.Series({0: list(players.index)}), positions).roster(0)
+        super().__init__(players)
+        self.slots: dict[str, Player] = dict(zip(self['spos'].tolist(), Player.from_frame(self)))
 
     def to_records(self) -> list[Player]:
-        return [Player(**row._asdict()) for row in self.itertuples()]
+        return Player.from_frame(self)
 
     @property
     def current_starters(self) -> 'Roster':
@@ -335,10 +1383,8 @@ class Roster(pd.DataFrame):
         return self.active.loc[self['pct_played'] == 1]
 
     def at_position(self, position: str) -> Player:
-        df = self.loc[(self['spos'] == position)]
-        if not df.empty:
-            return Player(**df.iloc[0].to_dict())
-        return Player()
+        player = self.slots.get(position)
+        return player if player is not None else Player()
 
 
 @dataclass
@@ -352,10 +1398,17 @@ class FantasyTeam:
     matchup_id: str
     record: str
     rank: int
+    roster_id: InitVar[Optional[int]] = None
+    lineups: InitVar[Optional[Lineups]] = None
     roster: Roster = field(init=False)
 
-    def __post_init__(self, players: pd.Series, all_players: pd.DataFrame, positions: Positions):
-        self.roster = Roster(all_players.loc[players], positions)
+    def __post_init__(self, players: pd.Series, all_players: pd.DataFrame, positions: Positions,
+                      roster_id: Optional[int], lineups: Optional[Lineups]):
+        if lineups is not None:
+            self.roster = lineups.roster(roster_id)
+            return
+        rostered = all_players.index.intersection(players or [])
+        self.roster = Roster(all_players.loc[rostered], positions)
 
     @property
     def avatar_url(self) -> str:
@@ -383,30 +1436,63 @@ class Matchup:
     team1: FantasyTeam
     team2: FantasyTeam
     positions: Positions
+    win_probability: Optional[float] = None
+
+    STYLE = Style({
+        'table': {'width': '100%', 'max-width': '600px', 'table-layout': 'fixed'},
+        'avatar': {'width': '35px', 'height': '35px', 'border-radius': '20px'},
+        'name': {'line-height': '1.2em', 'text-overflow': 'ellipsis', 'overflow': 'hidden', 'white-space': 'nowrap'},
+        'live': {'font-weight': 'bold'},
+        'info': {'font-size': '0.8em', 'line-height': '0.8em', 'opacity': '0.8'},
+        'points': {'line-height': '1.2em', 'text-align': 'right'},
+        'projection': {'font-size': '0.8em', 'text-align': 'right', 'line-height': '0.8em', 'opacity': '0.8'},
+        'label': {'text-align': 'center', 'vertical-align': 'middle', 'font-size': '0.6em', 'opacity': '0.8'},
+        'status': {'font-size': '0.8em', 'font-style': 'italic', 'line-height': '1em', 'opacity': '0.6'},
+        'hr': {'border': 'none', 'border-top': '1px solid rgba(128, 128, 128, 0.3)'},
+        'details': {'max-width': '600px', 'margin-bottom': '1em'},
+        'summary': {'cursor': 'pointer', 'font-size': '0.9em', 'opacity': '0.8'},
+    })
+
+    @staticmethod
+    def render_all(matchups: list['Matchup']):
+        if not matchups:
+            return
+        timezone = st.context.timezone
+        with METRICS.timer('Matchup.render'):
+            st.html(''.join(Matchup._markup(m.key, timezone, m) for m in matchups))
 
     def render(self):
+        Matchup.render_all([self])
+
+    @staticmethod
+    @cache_data(ttl=STATS_TTL, max_entries=512)
+    def _markup(key: str, timezone: Optional[str], _matchup: 'Matchup') -> str:
+        return _matchup.to_html()
+
+    @property
+    def key(self) -> str:
+        digest = hashlib.sha1()
+        digest.update(','.join(self.positions.index).encode())
+        digest.update(repr(self.win_probability).encode())
+        for team in (self.team1, self.team2):
+            digest.update(repr((team.name, team.username, team.avatar,
+                                team.record, str(team.rank))).encode())
+            digest.update(pd.util.hash_pandas_object(team.roster).to_numpy())
+        return digest.hexdigest()
+
+    @METRICS.timed('Matchup.to_html')
+    def to_html(self) -> str:
         t1 = self.team1
         t2 = self.team2
+        s = self.STYLE
         doc, tag, text, line = Doc().ttl()
-        s = Style({
-            'table': {'width': '100%', 'max-width': '600px', 'table-layout': 'fixed'},
-            'avatar': {'width': '35px', 'height': '35px', 'border-radius': '20px'},
-            'name': {'line-height': '1.2em', 'text-overflow': 'ellipsis', 'overflow': 'hidden', 'white-space': 'nowrap'},
-            'live': {'font-weight': 'bold'},
-            'info': {'font-size': '0.8em', 'line-height': '0.8em', 'opacity': '0.8'},
-            'points': {'line-height': '1.2em', 'text-align': 'right'},
-            'projection': {'font-size': '0.8em', 'text-align': 'right', 'line-height': '0.8em', 'opacity': '0.8'},
-            'label': {'text-align': 'center', 'vertical-align': 'middle', 'font-size': '0.6em', 'opacity': '0.8'},
-            'status': {'font-size': '0.8em', 'font-style': 'italic', 'line-height': '1em', 'opacity': '0.6'},
-            'hr': {'border': 'none', 'border-top': '1px solid rgba(128, 128, 128, 0.3)'},
-        })
         with tag('table', style=s.table):
             with tag('tbody'):
                 with tag('tr'):
                     with tag('td', colspan=2, rowspan=2):
                         doc.stag('img', src=t1.avatar_url, style=s.avatar)
                     line('td', t1.points, style=s.points)
-                    line('td', "vs", rowspan="5", style=s.label)
+                    line('td', "vs", rowspan="5" if self.win_probability is None else "6", style=s.label)
                     with tag('td', colspan=2, rowspan=2):
                         doc.stag('img', src=t2.avatar_url, style=s.avatar)
                     line('td', t2.points, style=s.points)
@@ -422,12 +1508,16 @@ class Matchup:
                 with tag('tr'):
                     line('td', t1.played_counts, colspan=3, style=s.status)
                     line('td', t2.played_counts, colspan=3, style=s.status)
-
-        st.html(doc.getvalue())
-        with st.expander("Show players"):
-            self.render_players(self.positions, s)
-
-    def render_players(self, positions: pd.DataFrame, s: Style):
+                if self.win_probability is not None:
+                    with tag('tr'):
+                        line('td', f"{self.win_probability:.0%} to win", colspan=3, style=s.status)
+                        line('td', f"{1 - self.win_probability:.0%} to win", colspan=3, style=s.status)
+        with tag('details', style=s.details):
+            line('summary', "Show players", style=s.summary)
+            doc.asis(self.players_html(self.positions, s))
+        return doc.getvalue()
+
+    def players_html(self, positions: pd.DataFrame, s: Style) -> str:
         doc, tag, text, line = Doc().ttl()
         with tag('table', style=s.get('table', font_size="0.9em")):
             with tag('tbody'):
@@ -465,28 +1555,77 @@ class Matchup:
                     with tag('tr'):
                         line('td', p1.get_status(), colspan=3, style=s.status)
                         line('td', p2.get_status(), colspan=3, style=s.status)
-
-        st.html(doc.getvalue())
+        return doc.getvalue()
 
     def contains_user(self, username: str) -> bool:
         return self.team1.username == username or self.team2.username == username
 
 
+@dataclass
+class Snapshot:
+    # What League.matchups last computed, so a live refresh can redo only what moved
+    scoring: dict
+    projections_version: str
+    player_ids: pd.Index
+    game_statuses: pd.DataFrame
+    stats: StatStore
+    players: pd.DataFrame
+    lineups: Lineups
+
+    def matches(self, data: Data, player_ids: pd.Index) -> bool:
+        return (self.scoring == data.scoring and
+                self.projections_version == Data.version(data.projections) and
+                self.player_ids.equals(player_ids))
+
+    def changed(self, data: Data) -> pd.Index:
+        teams = self.changed_teams(self.game_statuses, data.game_statuses)
+        players = self.players.index[self.players['team'].isin(teams)]
+        stats = StatStore.coerce(data.stats).changed(StatStore.coerce(self.stats))
+        return players.union(stats.intersection(self.player_ids))
+
+    @staticmethod
+    def changed_teams(old: pd.DataFrame, new: pd.DataFrame) -> pd.Index:
+        if old is new:
+            return pd.Index([])
+        teams = old.index.union(new.index)
+        columns = old.columns.union(new.columns)
+        old = old.reindex(index=teams, columns=columns)
+        new = new.reindex(index=teams, columns=columns)
+        same = (old == new) | (old.isna() & new.isna())
+        return teams[~same.all(axis=1).to_numpy()]
+
+
 @dataclass
 class League:
     data: Data
 
     @staticmethod
-    def _calc_points_from_stats(stats: dict, scoring: dict):
-        def _compute(row):
-            total = 0.0
-            player_stats = stats.get(row.name, {})
-            for stat, pts in scoring.items():
-                value = player_stats.get(stat)
-                if value is not None and pd.notnull(value):
-                    total += value * pts
-            return total
-        return _compute
+    def _calc_points(stats: StatStore, scoring: dict, index: pd.Index) -> pd.Series:
+        return stats.score(scoring).reindex(index, fill_value=0)
+
+    @staticmethod
+    @cache_data(ttl=STATS_TTL, max_entries=64)
+    def _scores(scoring_key: str, stats_version: str, projections_version: str,
+                _scoring: dict, _stats: StatStore, _projections: StatStore) -> pd.DataFrame:
+        # Only the league's scoring keys matter, and there are far fewer of them
+        _stats = StatStore.coerce(_stats).prune(_scoring)
+        _projections = StatStore.coerce(_projections).prune(_scoring)
+        index = _stats.players.union(_projections.players)
+        return pd.DataFrame({
+            'points': League._calc_points(_stats, _scoring, index),
+            'projection': League._calc_points(_projections, _scoring, index),
+        }, index=index)
+
+    def scores(self, stats: Optional[StatStore] = None,
+               projections: Optional[StatStore] = None) -> pd.DataFrame:
+        stats = self.data.stats if stats is None else stats
+        projections = self.data.projections if projections is None else projections
+        scoring = self.data.scoring
+        scoring_key = hashlib.sha1(json.dumps(
+            scoring, sort_keys=True).encode()).hexdigest()
+        return self._scores(
+            scoring_key, Data.version(stats), Data.version(projections),
+            scoring, stats, projections)
 
     @property
     def id(self) -> int:
@@ -494,50 +1633,92 @@ class League:
 
     @property
     def name(self) -> str:
-        return self.data.league.get_league_name()
-    
+        return self.data.settings['name']
+
     @property
     def playoff_week_start(self) -> int:
-        return self.data.league.get_league()['settings']['playoff_week_start']
+        return self.data.settings['settings']['playoff_week_start']
 
-    def players(self) -> pd.DataFrame:
-        df = self.data.players.copy(
-        )[['team', 'first_name', 'last_name', 'position', 'injury_status']]
+    def player_ids(self) -> pd.Index:
+        df = self.data.matchups
+        if df.empty or 'players' not in df.columns:
+            return pd.Index([])
+        return pd.Index(df['players'].explode().dropna().unique())
+
+    @METRICS.timed('League.players')
+    def players(self, player_ids: Optional[pd.Index] = None) -> pd.DataFrame:
+        df = self.data.players
+        if player_ids is not None:
+            df = df.loc[df.index.intersection(player_ids)]
+        df = df[['team', 'first_name', 'last_name', 'position', 'injury_status']]
         df = df[df['team'].notna()]
+        # Back to plain objects (None for missing) for the few rostered rows
+        categories = [col for col in PlayerStore.CATEGORIES if df[col].dtype == 'category']
+        if categories:
+            df = df.copy()
+            df[categories] = df[categories].astype(object).where(df[categories].notna(), None)
         df = df.join(self.data.game_statuses, on='team', how='left')
-        df['pct_played'] = (df['quarter'] * 15 - df['clock'] / 60) / 60
-        df['pct_played'] = df['pct_played'].clip(0, 1)
+        df['pct_played'] = Data.pct_played(df)
         df['bye'] = False
         df.loc[df['pct_played'].isna(), 'bye'] = True
         df.loc[df['pct_played'].isna(), 'pct_played'] = 0
-        df['points'] = df.apply(
-            self._calc_points_from_stats(self.data.stats, self.data.scoring), axis=1)
-        df['projection'] = df.apply(
-            self._calc_points_from_stats(self.data.projections, self.data.scoring), axis=1)
+        scores = self.scores().reindex(df.index, fill_value=0)
+        df['points'] = scores['points']
+        df['projection'] = scores['projection']
         df['optimistic'] = df['points'] + \
             (1 - df['pct_played']) * df['projection']
-        return df[['first_name', 'last_name', 'team', 'position', 'pct_played', 'points', 'projection', 'optimistic', 'bye', 'injury_status', 'game_status', 'home', 'opponent', 'score', 'opponent_score', 'game_time']]
-
+        df = df.join(Player.display(df, st.context.timezone))
+        return df[['first_name', 'last_name', 'team', 'position', 'pct_played', 'points', 'projection', 'optimistic', 'bye', 'injury_status', 'game_status', 'home', 'opponent', 'score', 'opponent_score', 'game_time'] + Player.DISPLAY_COLUMNS]
+
+    def _lineups(self, rosters: pd.Series, positions: Positions) -> tuple[pd.DataFrame, Lineups]:
+        player_ids = self.player_ids()
+        snapshot = self.data._snapshot
+        if snapshot is not None and snapshot.matches(self.data, player_ids):
+            changed = snapshot.changed(self.data)
+            all_players = snapshot.players
+            if not changed.empty:
+                fresh = self.players(changed.intersection(all_players.index))
+                all_players = all_players.copy()
+                all_players.loc[fresh.index, fresh.columns] = fresh
+            lineups = Lineups(all_players, rosters, positions,
+                              previous=snapshot.lineups, changed=changed)
+        else:
+            all_players = self.players(player_ids)
+            lineups = Lineups(all_players, rosters, positions)
+        self.data._snapshot = Snapshot(
+            scoring=self.data.scoring, projections_version=Data.version(self.data.projections),
+            player_ids=player_ids, game_statuses=self.data.game_statuses,
+            stats=self.data.stats, players=all_players, lineups=lineups)
+        return all_players, lineups
+
+    @METRICS.timed('League.matchups')
     def matchups(self, context) -> list[Matchup]:
         df = self.data.matchups
         if df.empty or 'roster_id' not in df.columns:
             return []
         df = df.join(self.data.rosters, on='roster_id', how='left')
 
-        all_players = self.players()
         positions = Positions(self.data)
+        all_players, lineups = self._lineups(df.set_index('roster_id')['players'], positions)
         grouped = []
+        pairs = []
         # Group by matchup_id and collect teams
         for _, group in df.groupby('matchup_id'):
-            teams_df = group[['name', 'username',
+            teams_df = group[['roster_id', 'name', 'username',
                               'matchup_id', 'players', 'avatar', 'record', 'rank']]
             if len(teams_df) == 2:
                 team1 = FantasyTeam(
-                    **teams_df.iloc[0].to_dict(), all_players=all_players, positions=positions)
+                    **teams_df.iloc[0].to_dict(), all_players=all_players, positions=positions, lineups=lineups)
                 team2 = FantasyTeam(
-                    **teams_df.iloc[1].to_dict(), all_players=all_players, positions=positions)
+                    **teams_df.iloc[1].to_dict(), all_players=all_players, positions=positions, lineups=lineups)
                 grouped.append(
                     Matchup(team1=team1, team2=team2, positions=positions))
+                pairs.append(tuple(teams_df['roster_id']))
+        with METRICS.timer('Simulation'):
+            probabilities = Simulation.cached(
+                Simulation.key(lineups, positions), pairs, lineups, positions)
+        for matchup, probability in zip(grouped, probabilities):
+            matchup.win_probability = probability
         # Sort so that matchups involving the context user come first
         if context.username:
             grouped = sorted(
@@ -545,14 +1726,100 @@ class League:
         return grouped
 
 
+@dataclass
+class Season:
+    league: League
+    season: int
+    current_week: int
+    last_week: int = 18
+
+    def fetch(self) -> dict:
+        data = self.league.data
+        league = data.league
+        playoff_week_start = self.league.playoff_week_start
+        fetchers = {}
+        for week in range(1, min(self.current_week, self.last_week) + 1):
+            if week < self.current_week:
+                fetchers.update({
+                    ('matchups', week): lambda w=week: Data.get_final_matchups(
+                        league.league_id, w, playoff_week_start, league),
+                    ('stats', week): lambda w=week: Data.get_final_stats(self.season, w),
+                    ('projections', week): lambda w=week: Data.get_final_projections(self.season, w),
+                })
+            else:
+                fetchers.update({
+                    ('matchups', week): lambda w=week: Data.get_matchups(
+                        league.league_id, w, playoff_week_start, league),
+                    ('stats', week): lambda w=week: Data.get_stats(self.season, w),
+                    ('projections', week): lambda w=week: Data.get_projections(self.season, w),
+                })
+        return Data.fetch(fetchers)
+
+    def week(self, week: int, matchups: pd.DataFrame, stats: StatStore,
+             projections: StatStore, positions: Positions) -> pd.DataFrame:
+        if matchups.empty or 'players' not in matchups.columns:
+            return pd.DataFrame(columns=['week', 'matchup_id', 'points', 'projection'])
+        players = self.league.data.players
+        ids = pd.Index(matchups['players'].explode().dropna().unique())
+        df = players.loc[players.index.intersection(ids), ['position']].copy()
+        scores = self.league.scores(stats, projections).reindex(df.index, fill_value=0)
+        df['points'] = scores['points']
+        df['projection'] = scores['projection']
+        # Lineups picks spos by pre-game projection and current_position by actual points
+        df['optimistic'] = df['projection']
+        lineups = Lineups(df, matchups.set_index('roster_id')['players'], positions)
+        actual = lineups[~lineups['current_position'].str.startswith('BN')]
+        projected = lineups[~lineups['spos'].str.startswith('BN')]
+        teams = matchups.set_index('roster_id')[['matchup_id']].copy()
+        teams['week'] = week
+        teams['points'] = actual.groupby(level='roster_id')['points'].sum()
+        teams['projection'] = projected.groupby(level='roster_id')['projection'].sum()
+        return teams.fillna({'points': 0, 'projection': 0})
+
+    def weeks(self) -> pd.DataFrame:
+        fetched = self.fetch()
+        positions = Positions(self.league.data)
+        frames = [self.week(week, fetched[('matchups', week)], fetched[('stats', week)],
+                            fetched[('projections', week)], positions)
+                  for week in sorted({week for _, week in fetched})]
+        df = pd.concat(frames)
+        opponent = df.groupby(['week', 'matchup_id'])['points'].transform('sum') - df['points']
+        # The current week's games may still be going, so it has no result yet
+        df['final'] = df['week'] < self.current_week
+        df['win'] = df['final'] & (df['points'] > opponent)
+        df['loss'] = df['final'] & (df['points'] < opponent)
+        df['tie'] = df['final'] & (df['points'] == opponent)
+        return df
+
+    def standings(self) -> pd.DataFrame:
+        df = self.weeks()
+        regular = df[df['week'] < self.league.playoff_week_start]
+        final = regular['final']
+        regular = regular.assign(
+            points_for=regular['points'].where(final, 0),
+            projected_for=regular['projection'].where(final, 0),
+            partial_points=regular['points'].where(~final, 0))
+        df = regular.groupby(level=0).agg(
+            wins=('win', 'sum'), losses=('loss', 'sum'), ties=('tie', 'sum'),
+            points_for=('points_for', 'sum'), projected_for=('projected_for', 'sum'),
+            partial_points=('partial_points', 'sum'))
+        df['vs_projection'] = df['points_for'] - df['projected_for']
+        df = df.join(self.league.data.rosters[['name']])
+        df = df.sort_values(by=['wins', 'points_for'], ascending=[False, False])
+        return df[['name', 'wins', 'losses', 'ties', 'points_for', 'projected_for', 'vs_projection',
+                   'partial_points']]
+
+
 class Context:
     season: int
     week: int
+    current_week: int
     username: Optional[str]
+    live: bool
     leagues: List[League]
 
     @staticmethod
-    @st.cache_data(ttl=METADATA_TTL)
+    @cache_data(ttl=METADATA_TTL)
     def _leagues(season: int, params: dict):
         username = params.get('username')
         locked_league_id = params.get('league')
@@ -561,24 +1828,54 @@ class Context:
         if locked_league_id:
             leagues = [locked_league_id]
         elif username:
-            user = sleeper.User(username)
-            leagues = [l['league_id']
-                       for l in user.get_all_leagues('nfl', season)]
+            user = HTTP.get_json(f"{Data.SLEEPER_URL}/user/{username}")
+            leagues = [l['league_id'] for l in HTTP.get_json(
+                f"{Data.SLEEPER_URL}/user/{user['user_id']}/leagues/nfl/{season}")] if user else []
             if not leagues:
                 st.warning("No leagues found for this user.")
         return leagues
 
     def __init__(self):
-        current = sleeper.get_sport_state('nfl')
+        current = HTTP.get_json(f"{Data.SLEEPER_URL}/state/nfl")
         self.username = st.query_params.get('username')
         self.season = int(current['league_season'])
         display_week = int(current['display_week'])
-        self.week = st.session_state.get(
-            'week') or (display_week if display_week > 0 else 1)
+        self.current_week = display_week if display_week > 0 else 1
+        self.week = st.session_state.get('week') or self.current_week
+        self.live = bool(st.session_state.get('live'))
         self.leagues = []
         for league_id in self._leagues(self.season, st.query_params.to_dict()):
-            data = Data(league_id=league_id, context=self)
-            self.leagues.append(League(data=data))
+            self.leagues.append(League(data=self._data(league_id)))
+
+    def _data(self, league_id: int) -> Data:
+        if not self.live:
+            return Data(league_id=league_id, context=self)
+        # Live mode pins everything but stats and game statuses for the session
+        key = f"data:{league_id}:{self.season}:{self.week}"
+        if key not in st.session_state:
+            st.session_state[key] = Data(league_id=league_id, context=self)
+        return st.session_state[key]
+
+
+def render_league(league: League, context: Context):
+    if context.live:
+        league.data.refresh_live(context.season, context.week)
+    Matchup.render_all(league.matchups(context))
+
+
+def render_season(league: League, context: Context):
+    standings = Season(league, context.season, context.current_week).standings()
+    st.dataframe(standings.round(2), hide_index=True)
+
+
+def render_metrics():
+    snapshot = METRICS.snapshot()
+    with st.expander("Metrics", expanded=True):
+        st.markdown("Wall time per stage and data source (seconds)")
+        st.dataframe(pd.DataFrame.from_dict(snapshot['timings'], orient='index'))
+        st.markdown("Cache hits and misses")
+        st.dataframe(pd.DataFrame.from_dict(snapshot['caches'], orient='index'))
+        st.json(snapshot, expanded=False)
 
 
 def main():
@@ -603,13 +1900,22 @@ def main():
     if context.leagues:
         st.number_input("Week", min_value=1, max_value=18,
                         key='week', value=context.week)
+        st.toggle("Live scores", key='live', value=context.live)
+        season_view = st.toggle("Season standings", key='season_view')
 
+    render = st.fragment(render_league, run_every=LIVE_TTL) if context.live else render_league
+    if context.leagues and season_view:
+        render = render_season
     for league in context.leagues:
         st.markdown(f"## {league.name}")
-        for matchup in league.matchups(context):
-            matchup.render()
+        render(league, context)
         st.markdown(f"(League ID: {league.id})")
 
+    if st.query_params.get('debug'):
+        render_metrics()
+    if METRICS_PATH:
+        METRICS.dump(METRICS_PATH)
+
 
 if __name__ == "__main__":
     main()
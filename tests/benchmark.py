@@ -0,0 +1,182 @@
+"""Time the hot paths against synthetic large-league inputs.
+
+    python -m tests.benchmark --teams 10 12 14 32 --repeat 5 --output benchmark.jsonl
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import tests.mock
+from streamlit_app import (League, Lineups, PlayerStore, Positions, Roster, SleeperLeague,
+                           Simulation, StatStore)
+
+NFL_TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET',
+    'GB', 'HOU', 'IND', 'JAX', 'KC', 'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE',
+    'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS',
+]
+POSITIONS = {'QB': 0.1, 'RB': 0.2, 'WR': 0.3, 'TE': 0.15, 'K': 0.05, 'DEF': 0.05, 'OL': 0.15}
+ROSTER_POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'FLEX', 'FLEX',
+                    'SUPER_FLEX', 'K', 'DEF'] + ['BN'] * 10
+SCORING = {
+    'pass_yd': 0.04, 'pass_td': 4, 'pass_int': -1, 'pass_2pt': 2,
+    'rush_yd': 0.1, 'rush_td': 6, 'rush_2pt': 2, 'fum_lost': -2,
+    'rec': 1, 'rec_yd': 0.1, 'rec_td': 6, 'rec_2pt': 2,
+    'fgm_0_19': 3, 'fgm_20_29': 3, 'fgm_30_39': 3, 'fgm_40_49': 4, 'fgm_50p': 5,
+    'xpm': 1, 'fgmiss': -1, 'def_td': 6, 'sack': 1, 'int': 2, 'fum_rec': 2,
+    'safe': 2, 'pts_allow_0': 10, 'pts_allow_1_6': 7, 'pts_allow_7_13': 4,
+}
+# Wall-time budgets (seconds, best of the repeats) per (stage, teams)
+BUDGETS = {('Simulation', 14): 0.5}
+STAT_KEYS = list(SCORING) + ['gp', 'gs', 'off_snp', 'tm_off_snp', 'pass_att',
+                             'pass_cmp', 'rush_att', 'rec_tgt', 'pts_ppr', 'pts_std']
+
+
+def players(rng: np.random.Generator, n: int = 11_000) -> pd.DataFrame:
+    ids = [str(i) for i in range(1, n + 1)]
+    return pd.DataFrame({
+        'team': rng.choice(NFL_TEAMS + [None] * 16, size=n),
+        'first_name': [f"First{i}" for i in ids],
+        'last_name': [f"Last{i}" for i in ids],
+        'position': rng.choice(list(POSITIONS), size=n, p=list(POSITIONS.values())),
+        'injury_status': rng.choice([None] * 16 + ['Questionable', 'Out', 'IR'], size=n),
+    }, index=ids)[PlayerStore.COLUMNS]
+
+
+def game_statuses(rng: np.random.Generator) -> pd.DataFrame:
+    kickoff = datetime(2024, 9, 8, 17, tzinfo=timezone.utc)
+    teams = list(rng.permutation(NFL_TEAMS))
+    statuses = {}
+    for home, away in zip(teams[::2], teams[1::2]):
+        quarter = int(rng.integers(0, 5))
+        clock = int(rng.integers(0, 15 * 60)) if 0 < quarter < 4 else 0
+        game_time = (kickoff + timedelta(hours=3 * int(rng.integers(0, 3)))).isoformat()
+        score, opponent_score = (int(x) for x in rng.integers(0, 35, size=2))
+        for team, opponent, is_home, points, against in [
+                (home, away, True, score, opponent_score),
+                (away, home, False, opponent_score, score)]:
+            statuses[team] = tests.mock.game_status(
+                quarter=quarter, clock=clock, home=is_home, opponent=opponent,
+                score=points, opponent_score=against, game_time=game_time,
+                game_status=f"Q{quarter}" if quarter else 'Upcoming')
+    return pd.DataFrame.from_dict(statuses, orient='index')
+
+
+def stats(rng: np.random.Generator, player_ids: pd.Index, share: float) -> StatStore:
+    ids = rng.choice(player_ids, size=int(len(player_ids) * share), replace=False)
+    values = rng.gamma(1.0, 10.0, size=(len(STAT_KEYS), len(ids))).round(1)
+    values[rng.random(values.shape) < 0.6] = np.nan
+    return StatStore.from_frame(pd.DataFrame(values, index=STAT_KEYS, columns=ids))
+
+
+def league(rng: np.random.Generator, teams: int, all_players: pd.DataFrame):
+    data = tests.mock.data()
+    data.players = all_players
+    data.game_statuses = game_statuses(rng)
+    data.stats = stats(rng, all_players.index, 0.3)
+    data.projections = stats(rng, all_players.index, 0.6)
+    data.league = Mock(SleeperLeague)
+    data.league.league_id = teams
+    data.league.get_league.return_value = {
+        'name': f"{teams}-team league",
+        'scoring_settings': SCORING,
+        'roster_positions': ROSTER_POSITIONS,
+        'settings': {'playoff_week_start': 15},
+    }
+    rostered = rng.choice(all_players[all_players['team'].notna()].index,
+                          size=teams * len(ROSTER_POSITIONS), replace=False)
+    roster_ids = list(range(1, teams + 1))
+    data.matchups = pd.DataFrame({
+        'roster_id': roster_ids,
+        'matchup_id': [(r + 1) // 2 for r in roster_ids],
+        'players': [list(p) for p in np.array_split(rostered, teams)],
+    })
+    data.rosters = pd.DataFrame({
+        'avatar': [f"avatar{r}" for r in roster_ids],
+        'username': [f"user{r}" for r in roster_ids],
+        'name': [f"Team {r}" for r in roster_ids],
+        'record': ['1-1'] * teams,
+        'rank': roster_ids,
+    }, index=pd.Index(roster_ids, name='roster_id'))
+    return League(data=data)
+
+
+def timed(fn: Callable, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        st.cache_data.clear()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(teams: int, repeat: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    lg = league(rng, teams, players(rng))
+    context = Mock(username=None)
+    all_players = lg.players(lg.player_ids())
+    positions = Positions(lg.data)
+    rosters = lg.data.matchups.set_index('roster_id')['players']
+    lineups = Lineups(all_players, rosters, positions)
+    pairs = [(r, r + 1) for r in rosters.index[::2]]
+    matchups = lg.matchups(context)
+    stages = {
+        'League.players': lambda: lg.players(lg.player_ids()),
+        'Positions': lambda: Positions(lg.data),
+        'Roster': lambda: [Roster(all_players.loc[all_players.index.intersection(p)], positions)
+                           for p in rosters],
+        'Lineups': lambda: Lineups(all_players, rosters, positions),
+        'Simulation': lambda: Simulation(lineups, positions).win_probabilities(pairs),
+        'League.matchups': lambda: setattr(lg.data, '_snapshot', None) or lg.matchups(context),
+        'Matchup.render': lambda: [m.to_html() for m in matchups],
+    }
+    results = []
+    for stage, fn in stages.items():
+        times = timed(fn, repeat)
+        results.append({
+            'stage': stage,
+            'teams': teams,
+            'players': len(lg.data.players),
+            'best': min(times),
+            'median': statistics.median(times),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, nargs='+', default=[10, 12, 14, 32])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="append results as JSON lines to this file")
+    args = parser.parse_args()
+
+    recorded_at = datetime.now(timezone.utc).isoformat()
+    results = [dict(r, recorded_at=recorded_at)
+               for teams in args.teams for r in run(teams, args.repeat, args.seed)]
+    for r in results:
+        print(f"{r['stage']:<16} {r['teams']:>3} teams  best {r['best'] * 1000:8.1f} ms"
+              f"  median {r['median'] * 1000:8.1f} ms")
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.writelines(json.dumps(r) + '\n' for r in results)
+
+    over = [r for r in results if r['best'] > BUDGETS.get((r['stage'], r['teams']), float('inf'))]
+    for r in over:
+        print(f"{r['stage']} at {r['teams']} teams is over its "
+              f"{BUDGETS[(r['stage'], r['teams'])] * 1000:.0f} ms budget", file=sys.stderr)
+    sys.exit(1 if over else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Serve recorded Sleeper and ESPN responses as a stand-in for the live APIs.
+
+    SLEEPER_SOURCE=record streamlit run streamlit_app.py     # capture fixtures
+    python -m tests.fixture_server --port 8765 --speed 60    # replay a Sunday at 60x
+    SLEEPER_SOURCE=server streamlit run streamlit_app.py     # point the app at it
+"""
+import argparse
+import hashlib
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from streamlit_app import FIXTURES_DIR, Fixtures, ReplayHttp
+
+
+def handler(replay: ReplayHttp) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = f"https://{self.path.lstrip('/')}"
+            try:
+                body = json.dumps(replay.get_json(url)).encode()
+            except FileNotFoundError:
+                self.send_error(404, f"No fixture recorded for {url}")
+                return
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def serve(fixtures: Path, host: str = '127.0.0.1', port: int = 8765,
+          speed: Optional[float] = None) -> ThreadingHTTPServer:
+    replay = ReplayHttp(Fixtures(fixtures), speed=speed)
+    return ThreadingHTTPServer((host, port), handler(replay))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--speed', type=float,
+                        help="replay recorded snapshots at this multiple of real time")
+    args = parser.parse_args()
+
+    server = serve(args.fixtures, args.host, args.port, args.speed)
+    print(f"Serving {args.fixtures} on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,7 @@
 from dataclasses import asdict
 from unittest.mock import Mock
 import pandas as pd
-import sleeper_wrapper as sleeper
-from streamlit_app import Data, Context, Player
+from streamlit_app import Data, Context, Player, SleeperLeague
 
 def data() -> Data:
     return Data(
@@ -14,7 +13,7 @@ def data() -> Data:
         players=pd.DataFrame(),
         projections=pd.DataFrame(),
         stats=pd.DataFrame(),
-        league=Mock(sleeper.League)
+        league=Mock(SleeperLeague)
     )
 
 def game_status(**kwargs) -> dict:
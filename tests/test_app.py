@@ -29,4 +29,13 @@ def test_by_league_query_param():
     at.query_params['league'] = league_id
     at.run()
     assert any(league in m.value for m in at.markdown)
-    assert any(league_id in m.value for m in at.markdown)
\ No newline at end of file
+    assert any(league_id in m.value for m in at.markdown)
+
+def test_live_scores_survive_rerun():
+    at = _app()
+    at.query_params['league'] = league_id
+    at.run()
+    at.toggle(key='live').set_value(True).run()
+    at.run()
+    assert not at.exception
+    assert any(league in m.value for m in at.markdown)
@@ -0,0 +1,51 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import pytest
+from batch import matchup_rows, write
+from streamlit_app import Data, FantasyTeam, FetchError, Matchup
+
+
+def team(name: str, points: int) -> FantasyTeam:
+    players_df = pd.DataFrame.from_dict({
+        1: {'points': points, 'optimistic': points + 5, 'position': 'QB'},
+    }, orient='index')
+    positions_df = pd.DataFrame.from_dict({
+        'QB1': {'position': 'QB', 'eligible': ['QB']},
+    }, orient='index')
+    return FantasyTeam(
+        name=name, players=[1], all_players=players_df, username=name.lower(),
+        avatar='123456', matchup_id=1, record='2-1', rank=5, positions=positions_df)
+
+
+def test_rows_per_team(tmp_path):
+    matchup = Matchup(team1=team('A', 10), team2=team('B', 20), positions=pd.DataFrame(index=['QB1']))
+    rows = matchup_rows(123, 'League', [matchup])
+
+    assert [(r['team'], r['points'], r['projection'], r['opponent']) for r in rows] == [
+        ('A', 10.0, 15.0, 'B'),
+        ('B', 20.0, 25.0, 'A'),
+    ]
+
+    assert [r['win_probability'] for r in rows] == [None, None]
+    matchup.win_probability = 0.25
+    assert [r['win_probability'] for r in matchup_rows(123, 'League', [matchup])] == [0.25, 0.75]
+
+    path = tmp_path / 'out.json'
+    write(rows, str(path), 'json')
+    assert json.loads(path.read_text())[1]['opponent_projection'] == 15.0
+
+
+def fetch_league(league_id):
+    def fail():
+        raise ValueError(f"no league {league_id}")
+    return Data.fetch({'league': fail}) if league_id == 999 else league_id
+
+
+def test_failing_league_does_not_break_the_pool():
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        failing, ok = pool.submit(fetch_league, 999), pool.submit(fetch_league, 111)
+        with pytest.raises(FetchError, match="Failed to fetch league: no league 999") as e:
+            failing.result()
+        assert e.value.source == 'league'
+        assert ok.result() == 111
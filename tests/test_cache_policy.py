@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+import tests.mock
+from streamlit_app import FINAL_GRACE, IDLE_TTL, LIVE_TTL, METADATA_TTL, STATS_TTL, CachePolicy, Data
+
+KICKOFF = pd.Timestamp('2024-09-08T17:00:00Z').timestamp()
+
+
+def policy(**status) -> CachePolicy:
+    p = CachePolicy()
+    p.observe(2024, 1, pd.DataFrame.from_dict({
+        'A': tests.mock.game_status(quarter=4, clock=0),
+        'B': tests.mock.game_status(**status),
+    }, orient='index'))
+    return p
+
+
+def test_defaults_until_statuses_seen():
+    assert CachePolicy().ttl('stats', 2024, 1) == STATS_TTL
+    assert CachePolicy().ttl('projections', 2024, 1) == METADATA_TTL
+
+
+def test_live_game_polls_aggressively():
+    p = policy(quarter=2, clock=300, game_time='2024-09-08T17:00:00Z')
+    assert p.ttl('stats', 2024, 1, now=KICKOFF + 3600) == LIVE_TTL
+    assert p.ttl('projections', 2024, 1, now=KICKOFF + 3600) == STATS_TTL
+
+
+@pytest.mark.parametrize("until,expected", [
+    (-60, LIVE_TTL),
+    (10 * 60, LIVE_TTL),
+    (40 * 60, STATS_TTL),
+    (2 * 60 * 60, METADATA_TTL),
+    (3 * 24 * 60 * 60, IDLE_TTL),
+])
+def test_backs_off_until_kickoff(until, expected):
+    p = policy(quarter=0, clock=0, game_time='2024-09-08T17:00:00Z')
+    assert p.ttl('stats', 2024, 1, now=KICKOFF - until) == expected
+
+
+def test_all_games_final_is_idle():
+    p = policy(quarter=4, clock=0)
+    assert p.ttl('game_statuses', 2024, 1) == IDLE_TTL
+
+
+def test_overtime_is_live():
+    p = policy(quarter=5, clock=0, state='in')
+    assert p.ttl('stats', 2024, 1) == LIVE_TTL
+    assert Data.pct_played(pd.DataFrame([tests.mock.game_status(quarter=5, clock=0, state='in')])).iloc[0] < 1
+
+
+def test_polls_live_for_a_grace_period_after_the_final_whistle():
+    p = policy(quarter=4, clock=30, state='in')
+    p.observe(2024, 1, pd.DataFrame.from_dict({
+        'B': tests.mock.game_status(quarter=4, clock=0, state='post'),
+    }, orient='index'), now=KICKOFF)
+    assert p.is_live(2024, 1, now=KICKOFF + FINAL_GRACE - 60)
+    assert p.ttl('stats', 2024, 1, now=KICKOFF + FINAL_GRACE - 60) == LIVE_TTL
+    assert not p.is_live(2024, 1, now=KICKOFF + FINAL_GRACE)
+    assert p.ttl('stats', 2024, 1, now=KICKOFF + FINAL_GRACE) == IDLE_TTL
@@ -0,0 +1,129 @@
+import time
+import pytest
+import pandas as pd
+from unittest.mock import Mock
+import tests.mock
+from streamlit_app import LIVE_TTL, Data, FetchError, SleeperLeague
+
+
+def test_fetch_runs_all_sources():
+    results = Data.fetch({
+        'a': lambda: 1,
+        'b': lambda: 2,
+    })
+    assert results == {'a': 1, 'b': 2}
+
+
+def test_fetch_raises_failing_source():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(FetchError) as e:
+        Data.fetch({'a': lambda: 1, 'stats': fail})
+    assert e.value.source == 'stats'
+    assert isinstance(e.value.__cause__, ValueError)
+
+
+def test_fetch_skips_pool_when_nothing_pending():
+    assert Data.fetch({}) == {}
+
+
+def test_settings_fetched_once_until_invalidated(monkeypatch):
+    data = tests.mock.data()
+    data.league.league_id = 123
+    data.league.get_league.return_value = {
+        'scoring_settings': {'rec': 1},
+        'roster_positions': ['QB'],
+    }
+    assert data.scoring == {'rec': 1}
+    assert data.positions == ['QB']
+    assert data.league.get_league.call_count == 1
+
+    refreshed = Mock(SleeperLeague)
+    refreshed.league_id = 123
+    refreshed.get_league.return_value = {'scoring_settings': {'rec': 0.5}}
+    monkeypatch.setattr(Data, 'get_league', staticmethod(lambda league_id: refreshed))
+    monkeypatch.setattr(Data.get_league, 'clear', lambda league_id: None, raising=False)
+    data.invalidate_settings()
+    assert data.scoring == {'rec': 0.5}
+
+
+def test_games_in_progress():
+    data = tests.mock.data()
+    assert not data.games_in_progress
+    data.game_statuses = pd.DataFrame.from_dict({
+        'A': tests.mock.game_status(quarter=4, clock=0),
+        'B': tests.mock.game_status(quarter=0, clock=0),
+    }, orient='index')
+    assert not data.games_in_progress
+    data.game_statuses.loc['B', ['quarter', 'clock']] = [2, 300]
+    assert data.games_in_progress
+
+
+def statuses(quarter: int, clock: int) -> pd.DataFrame:
+    return pd.DataFrame.from_dict({
+        'A': tests.mock.game_status(quarter=quarter, clock=clock),
+    }, orient='index')
+
+
+def test_refresh_live_refetches_volatile_sources(monkeypatch):
+    monkeypatch.setattr(Data, 'get_game_statuses', staticmethod(lambda season, week: statuses(2, 300)))
+    monkeypatch.setattr(Data, 'get_stats', staticmethod(lambda season, week: f"get_stats {season} {week}"))
+    data = tests.mock.data()
+    data.refresh_live(2024, 1)
+    assert data.stats.empty
+
+    data._refreshed_at = 0
+    data.refresh_live(2024, 1)
+    assert data.games_in_progress
+    assert data.stats == "get_stats 2024 1"
+    assert data.rosters.empty
+
+
+@pytest.mark.parametrize("elapsed", [LIVE_TTL - 4, LIVE_TTL - 1])
+def test_refresh_live_on_every_fragment_tick(monkeypatch, elapsed):
+    monkeypatch.setattr(Data, 'get_game_statuses', staticmethod(lambda season, week: statuses(2, 300)))
+    monkeypatch.setattr(Data, 'get_stats', staticmethod(lambda season, week: f"get_stats {season} {week}"))
+    data = tests.mock.data()
+    data.game_statuses = statuses(2, 400)
+    data._refreshed_at = time.time() - elapsed
+    data.refresh_live(2024, 1)
+    assert data.stats == "get_stats 2024 1"
+
+
+def test_refresh_live_notices_kickoff_after_pregame_pin(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(Data, 'get_game_statuses', staticmethod(lambda season, week: statuses(1, 600)))
+    monkeypatch.setattr(Data, 'get_stats', staticmethod(
+        lambda season, week: fetched.append(week) or f"get_stats {season} {week}"))
+    data = tests.mock.data()
+    data.game_statuses = statuses(0, 0)
+    assert not data.games_in_progress
+
+    data._refreshed_at = 0
+    data.refresh_live(2024, 1)
+    assert data.games_in_progress
+    assert fetched == [1]
+
+
+def test_refresh_live_skips_stats_between_games(monkeypatch):
+    monkeypatch.setattr(Data, 'get_game_statuses', staticmethod(lambda season, week: statuses(0, 0)))
+    monkeypatch.setattr(Data, 'get_stats', staticmethod(lambda season, week: pytest.fail("stats refetched")))
+    data = tests.mock.data()
+    data.game_statuses = statuses(0, 0)
+    data._refreshed_at = 0
+    data.refresh_live(2024, 1)
+    assert data.stats.empty
+
+
+def test_matchups_and_settings_share_one_league_request(monkeypatch):
+    monkeypatch.setattr(Data, 'get_matchups', staticmethod(
+        lambda league_id, week, playoff_week_start, _league: playoff_week_start))
+    data = tests.mock.data()
+    data.league.get_league.return_value = {
+        'name': 'League', 'scoring_settings': {'rec': 1}, 'settings': {'playoff_week_start': 15}}
+
+    assert data._fetch_matchups(123, 1) == 15
+    assert data.scoring == {'rec': 1}
+    assert data.settings['name'] == 'League'
+    assert data.league.get_league.call_count == 1
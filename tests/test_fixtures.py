@@ -0,0 +1,46 @@
+import threading
+from unittest.mock import Mock
+import pytest
+from streamlit_app import Fixtures, Http, RecordingHttp, ReplayHttp
+from tests.fixture_server import serve
+
+URL = 'https://api.sleeper.app/v1/stats/nfl/regular/2024/1'
+
+
+def test_record_then_replay(tmp_path):
+    recorder = RecordingHttp(Fixtures(tmp_path))
+    recorder.session = Mock()
+    recorder.session.get.return_value = Mock(
+        status_code=200, headers={}, json=Mock(return_value={'41': {'rec': 3}}))
+    assert recorder.get_json(URL) == {'41': {'rec': 3}}
+    recorder.get_json(URL)
+    assert len(Fixtures(tmp_path).snapshots(URL)) == 1
+
+    assert ReplayHttp(Fixtures(tmp_path)).get_json(URL) == {'41': {'rec': 3}}
+    with pytest.raises(FileNotFoundError):
+        ReplayHttp(Fixtures(tmp_path)).get_json(URL + '/missing')
+
+
+def test_replay_follows_accelerated_clock(tmp_path):
+    fixtures = Fixtures(tmp_path)
+    fixtures.save(URL, {'quarter': 1}, at=1000)
+    fixtures.save(URL, {'quarter': 2}, at=2000)
+    replay = ReplayHttp(fixtures, speed=100)
+
+    replay.started_at -= 5
+    assert replay.get_json(URL) == {'quarter': 1}
+    replay.started_at -= 10
+    assert replay.get_json(URL) == {'quarter': 2}
+    assert ReplayHttp(fixtures).get_json(URL) == {'quarter': 2}
+
+
+def test_stand_in_server(tmp_path):
+    Fixtures(tmp_path).save(URL, {'41': {'rec': 3}})
+    server = serve(tmp_path, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        http = Http(server=f"http://127.0.0.1:{server.server_port}")
+        assert http.get_json(URL) == {'41': {'rec': 3}}
+        assert http.get_json(URL) == {'41': {'rec': 3}}
+    finally:
+        server.shutdown()
@@ -0,0 +1,55 @@
+import json
+from unittest.mock import Mock
+from streamlit_app import Http, shared_http
+
+
+def response(status: int, data=None, headers=None) -> Mock:
+    resp = Mock(status_code=status, headers=headers or {}, content=json.dumps(data).encode())
+    resp.json.return_value = data
+    return resp
+
+
+def test_revalidates_with_etag():
+    http = Http()
+    http.session = Mock()
+    http.session.get.side_effect = [
+        response(200, {'a': 1}, {'ETag': '"v1"'}),
+        response(304),
+    ]
+    assert http.get_json('https://example.com') == {'a': 1}
+    assert http.get_json('https://example.com') == {'a': 1}
+
+    _, kwargs = http.session.get.call_args
+    assert kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert kwargs['timeout'] == http.timeout
+
+
+def test_no_validators_without_cache_headers():
+    http = Http()
+    http.session = Mock()
+    http.session.get.side_effect = [response(200, [1]), response(200, [2])]
+    assert http.get_json('https://example.com') == [1]
+    assert http.get_json('https://example.com') == [2]
+
+    _, kwargs = http.session.get.call_args
+    assert kwargs['headers'] == {}
+
+
+def test_validated_payloads_stay_under_byte_cap():
+    http = Http(max_validated_bytes=30)
+    http.session = Mock()
+    http.session.get.side_effect = [
+        response(200, 'a' * 10, {'ETag': '"a"'}),
+        response(200, 'b' * 10, {'ETag': '"b"'}),
+        response(200, 'c' * 10, {'ETag': '"c"'}),
+        response(200, 'd' * 50, {'ETag': '"d"'}),
+    ]
+    for url in ['https://a', 'https://b', 'https://c', 'https://d']:
+        http.get_json(url)
+
+    assert list(http._validated) == ['https://b', 'https://c']
+    assert http._validated_bytes == 24
+
+
+def test_client_outlives_reruns():
+    assert shared_http() is shared_http()
@@ -1,6 +1,7 @@
+from unittest.mock import Mock
 import pandas as pd
 import tests.mock
-from streamlit_app import League
+from streamlit_app import League, PlayerStore
 
 
 def test_points_calculations():
@@ -58,3 +59,142 @@ def test_points_calculations():
     assert p5['points'] == 0
     assert p5['projection'] == 0
     assert p5['optimistic'] == 0
+
+
+def test_points_ignore_missing_stats():
+    data = tests.mock.data()
+    data.players = pd.DataFrame.from_dict({
+        1: tests.mock.player(team='A', position='QB'),
+        2: tests.mock.player(team='A', position='WR'),
+    }, orient='index')
+    data.game_statuses = pd.DataFrame.from_dict({
+        'A': tests.mock.game_status(quarter=4, clock=0),
+    }, orient='index')
+    data.projections = pd.DataFrame({
+        1: {'passing_yards': 200, 'passing_touchdowns': None}})
+    data.stats = pd.DataFrame({
+        1: {'passing_yards': 150, 'passing_touchdowns': float('nan'), 'rushing_yards': 10},
+        3: {'passing_yards': 300}})
+    data.league.get_league.return_value = {
+        'scoring_settings': {'passing_yards': 0.04, 'passing_touchdowns': 4},
+        'roster_positions': ['QB', 'WR']
+    }
+    df = League(data=data).players()
+
+    assert round(df.loc[1, 'points'], 2) == round(150*0.04, 2)
+    assert round(df.loc[1, 'projection'], 2) == round(200*0.04, 2)
+    assert df.loc[2, 'points'] == 0
+    assert df.loc[2, 'projection'] == 0
+
+
+def test_players_limited_to_ids():
+    data = tests.mock.data()
+    data.players = pd.DataFrame.from_dict({
+        '1': tests.mock.player(team='A', position='QB'),
+        '2': tests.mock.player(team='A', position='WR'),
+        '3': tests.mock.player(team=None, position='RB'),
+    }, orient='index')
+    data.game_statuses = pd.DataFrame.from_dict({
+        'A': tests.mock.game_status(),
+    }, orient='index')
+    data.matchups = pd.DataFrame([
+        {'roster_id': 1, 'matchup_id': 1, 'players': ['1', '3', '99']},
+        {'roster_id': 2, 'matchup_id': 1, 'players': None},
+    ])
+    data.league.get_league.return_value = {
+        'scoring_settings': {'passing_yards': 0.04},
+        'roster_positions': ['QB']
+    }
+    league = League(data=data)
+
+    assert set(league.player_ids()) == {'1', '3', '99'}
+    assert league.players(league.player_ids()).index.tolist() == ['1']
+
+
+def test_scores_shared_across_leagues_with_same_scoring(monkeypatch):
+    calls = []
+    calc_points = League._calc_points
+    monkeypatch.setattr(League, '_calc_points', staticmethod(
+        lambda *args: calls.append(1) or calc_points(*args)))
+
+    leagues = []
+    for _ in range(2):
+        data = tests.mock.data()
+        data.stats = pd.DataFrame({'41': {'rushing_yards': 41}})
+        data.projections = pd.DataFrame({'41': {'rushing_yards': 82}})
+        data.league.get_league.return_value = {
+            'scoring_settings': {'rushing_yards': 0.1}}
+        leagues.append(League(data=data))
+
+    first, second = (league.scores() for league in leagues)
+    assert len(calls) == 2
+    assert round(first.loc['41', 'points'], 2) == 4.1
+    assert second.equals(first)
+
+    leagues[1].data.stats = pd.DataFrame({'41': {'rushing_yards': 51}})
+    assert round(leagues[1].scores().loc['41', 'points'], 2) == 5.1
+    assert len(calls) == 4
+
+
+def test_players_from_compact_table():
+    data = tests.mock.data()
+    data.players = PlayerStore.compact(pd.DataFrame.from_dict({
+        '1': tests.mock.player(team='A', position='QB', injury_status=None),
+        '2': tests.mock.player(team='A', position='WR', injury_status='Out'),
+    }, orient='index').reindex(columns=PlayerStore.COLUMNS))
+    data.game_statuses = pd.DataFrame.from_dict({
+        'A': tests.mock.game_status(),
+    }, orient='index')
+    data.league.get_league.return_value = {
+        'scoring_settings': {'passing_yards': 0.04},
+        'roster_positions': ['QB']
+    }
+    df = League(data=data).players()
+
+    assert df.loc['1', 'injury_status'] is None
+    assert df.loc['2', 'injury_status'] == 'Out'
+    assert df.loc['1', 'opponent'] == 'XYZ'
+
+
+def test_live_refresh_recomputes_changed_players(monkeypatch):
+    data = tests.mock.data()
+    data.players = pd.DataFrame.from_dict({
+        '1': tests.mock.player(team='A', position='QB'),
+        '2': tests.mock.player(team='B', position='QB'),
+        '3': tests.mock.player(team='C', position='QB'),
+    }, orient='index')
+    data.game_statuses = pd.DataFrame.from_dict({
+        'A': tests.mock.game_status(quarter=2, clock=300),
+        'B': tests.mock.game_status(quarter=4, clock=0),
+        'C': tests.mock.game_status(quarter=0, clock=0),
+    }, orient='index')
+    data.projections = pd.DataFrame({'1': {'pass_yd': 250}, '2': {'pass_yd': 200}, '3': {'pass_yd': 300}})
+    data.stats = pd.DataFrame({'1': {'pass_yd': 100}, '2': {'pass_yd': 210}})
+    data.matchups = pd.DataFrame([
+        {'roster_id': 1, 'matchup_id': 1, 'players': ['1']},
+        {'roster_id': 2, 'matchup_id': 1, 'players': ['2', '3']},
+    ])
+    data.rosters = pd.DataFrame(
+        {'name': ['One', 'Two'], 'username': ['one', 'two'], 'avatar': ['', ''],
+         'record': ['0-0', '0-0'], 'rank': [1, 2]}, index=pd.Index([1, 2], name='roster_id'))
+    data.league.get_league.return_value = {
+        'scoring_settings': {'pass_yd': 0.04},
+        'roster_positions': ['QB', 'BN'],
+    }
+    league = League(data=data)
+    league.matchups(Mock(username=None))
+
+    data.stats = pd.DataFrame({'1': {'pass_yd': 150}, '2': {'pass_yd': 210}})
+    data.game_statuses = data.game_statuses.copy()
+    data.game_statuses.loc['A', 'quarter'] = 3
+    recomputed = []
+    players = League.players
+    monkeypatch.setattr(League, 'players', lambda self, ids=None: recomputed.append(
+        sorted(ids)) or players(self, ids))
+    (matchup,) = league.matchups(Mock(username=None))
+
+    assert recomputed == [['1']]
+    assert round(matchup.team1.roster.at_position('QB1').points, 2) == 6
+    assert round(matchup.team2.roster.at_position('BN1').points, 2) == 8.4
+    pd.testing.assert_frame_equal(
+        data._snapshot.players, players(league, league.player_ids()), check_dtype=False)
@@ -0,0 +1,60 @@
+import functools
+import random
+import pytest
+from streamlit_app import LineupSolver, Positions
+
+
+def solver(positions_data: list[tuple[str, list[str]]]) -> LineupSolver:
+    return LineupSolver(
+        tuple(p for p, _ in positions_data), tuple(tuple(e) for _, e in positions_data))
+
+
+def starter_total(values, assignment) -> float:
+    return sum(v for v, spos in zip(values, assignment)
+               if spos is not None and not spos.startswith('BN'))
+
+
+def brute_force(solver: LineupSolver, positions, values) -> float:
+    # Every way to fill the starting slots, any of which may be left empty
+    starters = [s for s in solver.slots if not s.startswith('BN')]
+
+    @functools.lru_cache(maxsize=None)
+    def best(slot: int, used: int) -> float:
+        if slot == len(starters):
+            return 0
+        bit = 1 << solver.slots.index(starters[slot])
+        return max([best(slot + 1, used)] + [
+            values[p] + best(slot + 1, used | 1 << p) for p in range(len(values))
+            if not used & 1 << p and solver.masks.get(positions[p], 0) & bit])
+
+    return best(0, 0)
+
+
+def test_flex_listed_before_dedicated_slot():
+    s = solver([('FLEX', ['RB', 'WR']), ('RB', ['RB']), ('BN', ['RB', 'WR'])])
+    assert s.assign(['RB', 'WR', 'RB'], [10, 5, 3]) == ['RB', 'FLEX', 'BN']
+
+
+def test_unfillable_slots_stay_empty():
+    s = solver([('QB', ['QB']), ('K', ['K'])])
+    assert s.assign(['QB', 'QB'], [5, 10]) == [None, 'QB']
+
+
+def test_missing_values_rank_last():
+    s = solver([('WR', ['WR']), ('BN', ['WR'])])
+    assert s.assign(['WR', 'WR'], [float('nan'), 1]) == ['BN', 'WR']
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force_for_superflex_layout(seed):
+    rng = random.Random(seed)
+    layout = ['QB', 'RB', 'WR', 'WR', 'TE', 'FLEX', 'SUPER_FLEX', 'BN', 'BN']
+    data = type('Data', (), {'positions': layout})()
+    s = LineupSolver.for_positions(Positions(data))
+    positions = [rng.choice(['QB', 'RB', 'WR', 'TE', 'K']) for _ in range(rng.randint(3, 10))]
+    values = [rng.randint(0, 30) for _ in positions]
+
+    assignment = s.assign(positions, values)
+    starters = [a for a in assignment if a and not a.startswith('BN')]
+    assert len(starters) == len(set(starters))
+    assert starter_total(values, assignment) == brute_force(s, positions, values)
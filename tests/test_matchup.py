@@ -0,0 +1,22 @@
+import pandas as pd
+from streamlit_app import FantasyTeam, Matchup
+
+
+def team(points: int) -> FantasyTeam:
+    players_df = pd.DataFrame.from_dict({
+        1: {'points': points, 'optimistic': 15, 'position': 'QB'},
+    }, orient='index')
+    positions_df = pd.DataFrame.from_dict({
+        'QB1': {'position': 'QB', 'eligible': ['QB']},
+    }, orient='index')
+    return FantasyTeam(
+        name='Test Team', players=[1], all_players=players_df, username='test_user',
+        avatar='123456', matchup_id=1, record='2-1', rank=5, positions=positions_df)
+
+
+def test_key_tracks_roster_content():
+    m1 = Matchup(team1=team(10), team2=team(5), positions=pd.DataFrame(index=['QB1']))
+    m2 = Matchup(team1=team(10), team2=team(5), positions=pd.DataFrame(index=['QB1']))
+    m3 = Matchup(team1=team(12), team2=team(5), positions=pd.DataFrame(index=['QB1']))
+    assert m1.key == m2.key
+    assert m1.key != m3.key
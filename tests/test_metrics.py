@@ -0,0 +1,42 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from streamlit_app import Metrics, shared_metrics
+
+
+def test_timings_and_cache_counts(tmp_path):
+    metrics = Metrics()
+
+    @metrics.timed('stage')
+    def stage(x):
+        return x * 2
+
+    assert stage(2) == 4
+    with metrics.timer('stage'):
+        pass
+    for key in ['calls', 'misses', 'calls', 'calls']:
+        metrics.count('Data.get_stats', key)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['timings']['stage']['count'] == 2
+    assert snapshot['caches']['Data.get_stats'] == {
+        'calls': 3, 'misses': 1, 'hits': 2, 'hit_rate': 2 / 3}
+
+    path = tmp_path / 'metrics.json'
+    metrics.dump(str(path))
+    assert json.loads(path.read_text())['caches']['Data.get_stats']['hits'] == 2
+
+    metrics.reset()
+    assert metrics.snapshot() == {'timings': {}, 'caches': {}}
+
+
+def test_concurrent_dumps(tmp_path):
+    metrics = Metrics()
+    path = tmp_path / 'metrics.json'
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: metrics.dump(str(path)), range(200)))
+    assert 'timings' in json.loads(path.read_text())
+    assert [p.name for p in tmp_path.iterdir()] == ['metrics.json']
+
+
+def test_registry_outlives_reruns():
+    assert shared_metrics() is shared_metrics()
@@ -84,4 +84,25 @@ def test_get_projection(player, expected):
     (player(injury_status='Questionable'), "RB - DAL (Q)"),
 ])
 def test_player_info(player, expected):
-    assert player.player_info == expected
\ No newline at end of file
+    assert player.player_info == expected
+
+def test_display_matches_getters():
+    players = [
+        player(), player(home=True), player(bye=True), player(projection=0.0),
+        player(game_status='5:00 4th Q', pct_played=0.5, score=14, opponent_score=7, points=10.0),
+        player(game_status='Final', pct_played=1, score=21, opponent_score=14),
+        player(injury_status='Questionable'), player(injury_status='Suspended'),
+    ]
+    frame = pd.DataFrame([asdict(p) for p in players])
+    df = Player.display(frame, None)
+
+    empty = Player.display(frame.iloc[:0], None)
+    assert empty.empty
+    assert empty.columns.tolist() == Player.DISPLAY_COLUMNS
+
+    for p, row in zip(players, df.to_dict(orient='records')):
+        assert row['status_text'] == p.get_status()
+        assert row['points_text'] == p.get_points()
+        assert row['projection_text'] == p.get_projection()
+        assert row['info_text'] == p.player_info
+        assert Player(**dict(asdict(p), **row)).get_status() == p.get_status()
@@ -0,0 +1,71 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import tests.mock
+from streamlit_app import PlayerStore
+
+
+def dump() -> pd.DataFrame:
+    return pd.DataFrame.from_dict({
+        '1': tests.mock.player(first_name='Jane', last_name='Smith', team='DAL', position='RB'),
+        '2': tests.mock.player(first_name='John', last_name='Doe', team=None, position='WR'),
+    }, orient='index').reindex(columns=PlayerStore.COLUMNS)
+
+
+def test_load_downloads_and_persists(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(PlayerStore, 'download',
+                        classmethod(lambda cls: calls.append(1) or dump()))
+    store = PlayerStore(path=tmp_path / 'players.parquet')
+    assert store.fetched_at is None
+
+    df = store.load()
+    assert calls == [1]
+    assert store.is_fresh
+
+    cached = PlayerStore(path=tmp_path / 'players.parquet').load()
+    assert calls == [1]
+    assert cached.index.tolist() == ['1', '2']
+    assert cached.loc['1', 'last_name'] == 'Smith'
+    assert cached.columns.tolist() == df.columns.tolist()
+
+
+def test_stale_store_is_refreshed(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(PlayerStore, 'download',
+                        classmethod(lambda cls: calls.append(1) or dump()))
+    store = PlayerStore(path=tmp_path / 'players.parquet', max_age=60)
+    store.save(dump())
+    stale = time.time() - 120
+    os.utime(store.path, (stale, stale))
+
+    assert not store.is_fresh
+    store.load()
+    assert calls == [1]
+    assert store.is_fresh
+
+
+def test_compact_dtypes(tmp_path, monkeypatch):
+    df = dump()
+    df.loc['3'] = df.loc['1']
+    monkeypatch.setattr(PlayerStore, 'download', classmethod(lambda cls: df.copy()))
+    store = PlayerStore(path=tmp_path / 'players.parquet')
+    store.load()
+
+    cached = PlayerStore(path=tmp_path / 'players.parquet').load()
+    for col in PlayerStore.CATEGORIES:
+        assert cached[col].dtype == 'category'
+    for col in PlayerStore.NAMES:
+        assert cached[col].dtype == object
+    assert cached.loc['1', 'last_name'] is cached.loc['3', 'last_name']
+    assert pd.isna(cached.loc['2', 'team'])
+
+
+def test_concurrent_saves_leave_no_temp_files(tmp_path):
+    store = PlayerStore(path=tmp_path / 'players.parquet')
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: store.save(dump()), range(8)))
+
+    assert [p.name for p in tmp_path.iterdir()] == ['players.parquet']
+    assert PlayerStore(path=store.path).load().index.tolist() == ['1', '2']
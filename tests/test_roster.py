@@ -1,6 +1,6 @@
 import pytest
 import pandas as pd
-from streamlit_app import Roster
+from streamlit_app import Lineups, Player, Roster
 
 
 def build_roster(players_data: list[tuple[str, int, int]], positions_data: list[tuple[str, list[str]]]) -> Roster:
@@ -52,3 +52,73 @@ def test_current_position_assignment(roster, expected):
 ])
 def test_optimal_position_assignment(roster, expected):
     assert roster.sort_index()['spos'].tolist() == expected
+
+
+def test_lineups_match_individual_rosters():
+    players_df = pd.DataFrame.from_dict({
+        'a': {'position': 'RB', 'points': 7, 'optimistic': 11},
+        'b': {'position': 'RB', 'points': 9, 'optimistic': 10},
+        'c': {'position': 'WR', 'points': 8, 'optimistic': 12},
+        'd': {'position': 'WR', 'points': 6, 'optimistic': 9},
+        'e': {'position': 'RB', 'points': 3, 'optimistic': 4},
+    }, orient='index')
+    positions_df = pd.DataFrame.from_dict({
+        pos: {'eligible': eligible} for pos, eligible in
+        [('RB', ['RB']), ('FLEX', ['RB', 'WR']), ('BN', ['RB', 'WR'])]
+    }, orient='index')
+    rosters = pd.Series({1: ['a', 'c', 'd'], 2: ['b', 'e', 'missing'], 3: None})
+    lineups = Lineups(players_df, rosters, positions_df)
+
+    for roster_id, players in [(1, ['a', 'c', 'd']), (2, ['b', 'e'])]:
+        expected = Roster(players_df.loc[players], positions_df)
+        assert lineups.roster(roster_id).equals(expected)
+    assert lineups.roster(3).empty
+
+
+def test_lineups_resolve_only_changed_rosters(monkeypatch):
+    players_df = pd.DataFrame.from_dict({
+        'a': {'position': 'RB', 'points': 7, 'optimistic': 11},
+        'b': {'position': 'RB', 'points': 9, 'optimistic': 10},
+        'c': {'position': 'WR', 'points': 8, 'optimistic': 12},
+        'e': {'position': 'RB', 'points': 3, 'optimistic': 4},
+    }, orient='index')
+    positions_df = pd.DataFrame.from_dict({
+        pos: {'eligible': eligible} for pos, eligible in
+        [('RB', ['RB']), ('FLEX', ['RB', 'WR'])]
+    }, orient='index')
+    rosters = pd.Series({1: ['a', 'c'], 2: ['b', 'e']})
+    previous = Lineups(players_df, rosters, positions_df)
+
+    players_df.loc['e', ['points', 'optimistic']] = [12, 15]
+    solved = []
+    solve = Lineups.solve
+    monkeypatch.setattr(Lineups, 'solve', classmethod(
+        lambda cls, players, r, positions: solved.append(list(r.index)) or solve(players, r, positions)))
+    lineups = Lineups(players_df, rosters, positions_df, previous=previous, changed=pd.Index(['e']))
+
+    assert solved == [[2]]
+    assert lineups.equals(Lineups(players_df, rosters, positions_df))
+    assert lineups.roster(2).at_position('RB').optimistic == 15
+
+
+def test_at_position_reads_slot_lookup():
+    roster = build_roster(
+        [('WR', 7, 11), ('WR', 8, 12)],
+        [('WR', ['WR']), ('TE', ['TE']), ('BN', ['WR'])]
+    )
+    assert roster.at_position('WR').optimistic == 12
+    assert roster.at_position('BN').optimistic == 11
+    assert roster.at_position('TE') == Player()
+
+
+def test_to_records_builds_plain_players():
+    roster = build_roster(
+        [('WR', 7, 11), ('WR', 8, 12)],
+        [('WR', ['WR']), ('BN', ['WR'])]
+    )
+    records = roster.to_records()
+
+    assert [(p.spos, p.current_position, p.points) for p in records] == [('WR', 'WR', 8), ('BN', 'BN', 7)]
+    assert type(records[0].points) is int
+    assert records[0].first_name == ''
+    assert not hasattr(records[0], '__dict__')
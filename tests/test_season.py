@@ -0,0 +1,49 @@
+import pandas as pd
+import tests.mock
+from streamlit_app import Data, League, Season
+
+
+def test_standings_across_weeks(monkeypatch):
+    matchups = pd.DataFrame([
+        {'roster_id': 1, 'matchup_id': 1, 'players': ['1', '2']},
+        {'roster_id': 2, 'matchup_id': 1, 'players': ['3']},
+    ])
+    stats = {
+        1: pd.DataFrame({'1': {'pass_yd': 250}, '2': {'rush_yd': 50}, '3': {'rush_yd': 120}}),
+        2: pd.DataFrame({'1': {'pass_yd': 100}, '3': {'rush_yd': 200}}),
+        3: pd.DataFrame({'1': {'pass_yd': 50}}),
+    }
+    projections = pd.DataFrame({'1': {'pass_yd': 200}, '2': {'rush_yd': 60}, '3': {'rush_yd': 80}})
+    calls = []
+    for final in ['', '_final']:
+        monkeypatch.setattr(Data, f'get{final}_matchups', staticmethod(
+            lambda league_id, week, playoff_week_start, _league: matchups))
+        monkeypatch.setattr(Data, f'get{final}_stats', staticmethod(
+            lambda season, week, final=final: calls.append((final, week)) or stats[week]))
+        monkeypatch.setattr(Data, f'get{final}_projections', staticmethod(
+            lambda season, week: projections))
+
+    data = tests.mock.data()
+    data.players = pd.DataFrame.from_dict({
+        '1': tests.mock.player(position='QB'),
+        '2': tests.mock.player(position='RB'),
+        '3': tests.mock.player(position='RB'),
+    }, orient='index')
+    data.rosters = pd.DataFrame({'name': ['A', 'B']}, index=pd.Index([1, 2], name='roster_id'))
+    data.league.league_id = 123
+    data.league.get_league.return_value = {
+        'scoring_settings': {'pass_yd': 0.04, 'rush_yd': 0.1},
+        'roster_positions': ['QB', 'RB'],
+        'settings': {'playoff_week_start': 15},
+    }
+    # Week 3 is under way: its partial scores are shown but decide nothing
+    standings = Season(League(data=data), season=2024, current_week=3).standings()
+
+    assert sorted(calls) == [('', 3), ('_final', 1), ('_final', 2)]
+    assert standings['name'].tolist() == ['B', 'A']
+    assert standings['wins'].tolist() == [1, 1]
+    assert standings['losses'].tolist() == [1, 1]
+    assert standings['ties'].tolist() == [0, 0]
+    assert standings['points_for'].round(2).tolist() == [12 + 20, 10 + 5 + 4]
+    assert standings['projected_for'].round(2).tolist() == [2 * 8, 2 * (8 + 6)]
+    assert standings['partial_points'].round(2).tolist() == [0, 2]
@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+import streamlit_app
+from streamlit_app import SqliteCache, cache_data
+
+
+def test_values_shared_between_instances(tmp_path):
+    calls = []
+    first = SqliteCache(tmp_path / 'cache.sqlite')
+    second = SqliteCache(tmp_path / 'cache.sqlite')
+
+    assert first.get_or_compute('stats', lambda: calls.append(1) or {'a': 1}, ttl=60) == {'a': 1}
+    assert second.get_or_compute('stats', lambda: calls.append(1) or {'a': 2}, ttl=60) == {'a': 1}
+    assert calls == [1]
+
+
+def test_expired_entries_are_missing(tmp_path):
+    cache = SqliteCache(tmp_path / 'cache.sqlite')
+    cache.set('stats', 1, ttl=0.01)
+    time.sleep(0.05)
+    assert cache.get('stats') is SqliteCache.MISSING
+
+
+def test_evicts_least_recently_used_over_budget(tmp_path):
+    cache = SqliteCache(tmp_path / 'cache.sqlite', max_bytes=300)
+    cache.set('a', 'a' * 100)
+    cache.set('b', 'b' * 100)
+    cache.get('a')
+    cache.set('c', 'c' * 100)
+    assert cache.get('b') is SqliteCache.MISSING
+    assert cache.get('a') == 'a' * 100
+    assert cache.get('c') == 'c' * 100
+
+
+def test_one_worker_holds_a_key_lease(tmp_path):
+    first = SqliteCache(tmp_path / 'cache.sqlite')
+    second = SqliteCache(tmp_path / 'cache.sqlite')
+    assert first._acquire('stats')
+    assert not second._acquire('stats')
+    first._release('stats')
+    assert second._acquire('stats')
+
+
+def test_waiter_takes_over_when_lease_holder_fails(tmp_path):
+    holder = SqliteCache(tmp_path / 'cache.sqlite', lease=3)
+    waiter = SqliteCache(tmp_path / 'cache.sqlite', lease=3)
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.3)
+        raise ValueError("upstream down")
+
+    def hold():
+        with pytest.raises(ValueError):
+            holder.get_or_compute('stats', fail)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    started.wait()
+    start = time.time()
+    assert waiter.get_or_compute('stats', lambda: {'a': 1}) == {'a': 1}
+    assert time.time() - start < 1.5
+    thread.join()
+
+
+def test_keys_are_scoped_to_the_defining_module(tmp_path, monkeypatch):
+    cache = SqliteCache(tmp_path / 'cache.sqlite')
+    monkeypatch.setattr(streamlit_app, 'SHARED_CACHE', cache)
+
+    @cache_data(shared=True, ttl=60)
+    def payload(week: int) -> dict:
+        return {'week': week}
+
+    assert payload(1) == {'week': 1}
+    [(key,)] = cache._connect().execute('SELECT key FROM entries').fetchall()
+    assert key.startswith(f"{__name__}:")
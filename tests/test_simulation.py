@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import tests.benchmark
+from streamlit_app import Lineups, Positions, Simulation
+
+POSITIONS = pd.DataFrame.from_dict({
+    pos: {'eligible': eligible} for pos, eligible in [
+        ('QB1', ['QB']), ('RB1', ['RB']), ('WR1', ['WR']),
+        ('FX1', ['RB', 'WR', 'TE']), ('SFX1', ['QB', 'RB', 'WR', 'TE']),
+        ('BN1', ['QB', 'RB', 'WR', 'TE'])]
+}, orient='index')
+
+
+def lineups(players: dict[str, tuple[str, float, float, float]], rosters: dict) -> Lineups:
+    df = pd.DataFrame.from_dict({
+        pid: {'position': pos, 'points': points, 'projection': projection,
+              'pct_played': pct_played, 'optimistic': points + (1 - pct_played) * projection}
+        for pid, (pos, points, projection, pct_played) in players.items()
+    }, orient='index')
+    return Lineups(df, pd.Series(rosters), POSITIONS)
+
+
+def test_finished_games_sum_best_ball_lineup():
+    sim = Simulation(lineups({
+        'q1': ('QB', 20, 18, 1), 'q2': ('QB', 15, 18, 1),
+        'r1': ('RB', 12, 10, 1), 'r2': ('RB', 30, 10, 1),
+        'w1': ('WR', 8, 10, 1), 'w2': ('WR', 3, 10, 1),
+        'q3': ('QB', 10, 10, 1), 'w3': ('WR', 25, 10, 1),
+    }, {1: ['q1', 'q2', 'r1', 'r2', 'w1', 'w2'], 2: ['q3', 'w3']}), POSITIONS, trials=10)
+
+    totals = sim.totals()
+    assert totals[:, 0].tolist() == [20 + 30 + 8 + 12 + 15] * 10
+    assert totals[:, 1].tolist() == [10 + 25] * 10
+    assert sim.win_probabilities([(1, 2), (2, 1), (3, 4)]) == [1.0, 0.0, 0.5]
+
+
+def test_remaining_projection_moves_win_probability():
+    sim = Simulation(lineups({
+        'a': ('QB', 10, 30, 0.5), 'b': ('QB', 20, 30, 1),
+    }, {1: ['a'], 2: ['b']}), POSITIONS)
+
+    [p] = sim.win_probabilities([(1, 2)])
+    assert 0.5 < p < 1
+
+
+def test_fourteen_team_league_probabilities():
+    rng = np.random.default_rng(0)
+    lg = tests.benchmark.league(rng, 14, tests.benchmark.players(rng))
+    positions = Positions(lg.data)
+    rosters = lg.data.matchups.set_index('roster_id')['players']
+    all_lineups = Lineups(lg.players(lg.player_ids()), rosters, positions)
+    pairs = [(r, r + 1) for r in rosters.index[::2]]
+
+    probabilities = Simulation(all_lineups, positions).win_probabilities(pairs)
+    assert len(probabilities) == 7
+    assert all(0 <= p <= 1 for p in probabilities)
+    assert probabilities == Simulation(all_lineups, positions).win_probabilities(pairs)
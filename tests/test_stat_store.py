@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from streamlit_app import StatStore
+
+PAYLOAD = {
+    '1': {'rec': 3, 'rec_yd': 42.0, 'gp': 1},
+    '2': {'rush_yd': 10.0, 'rec': 0, 'fum_lost': None},
+    '3': {},
+}
+SCORING = {'rec': 1, 'rec_yd': 0.1, 'rush_yd': 0.1}
+
+
+def test_score_matches_dense():
+    store = StatStore.from_payload(PAYLOAD)
+    dense = pd.DataFrame(PAYLOAD).reindex(index=list(SCORING)).astype(float).fillna(0)
+    expected = pd.Series(np.array(list(SCORING.values())) @ dense.to_numpy(), index=dense.columns)
+    pd.testing.assert_series_equal(store.score(SCORING), expected)
+
+
+def test_skips_missing_and_zero_values():
+    store = StatStore.from_payload(PAYLOAD)
+    assert store.row('2') == {'rush_yd': 10.0}
+    assert store.row('3') == {}
+    assert store.row('unknown') == {}
+
+
+def test_from_frame_matches_payload():
+    frame = StatStore.from_frame(pd.DataFrame(PAYLOAD))
+    assert frame.version == StatStore.from_payload(PAYLOAD).version
+    assert StatStore.from_frame(pd.DataFrame()).empty
+
+
+def test_prune_keeps_scoring_keys():
+    store = StatStore.from_payload(PAYLOAD).prune(SCORING)
+    assert set(store.keys) == {'rec', 'rec_yd', 'rush_yd'}
+    assert store.row('1') == {'rec': 3.0, 'rec_yd': 42.0}
+    pd.testing.assert_series_equal(store.score(SCORING),
+                                   StatStore.from_payload(PAYLOAD).score(SCORING))